@@ -6,9 +6,11 @@ Provides high inventory and stable pricing for happy-path scenarios.
 
 import hashlib
 import random
+import sys
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Iterator
+from itertools import islice
+from typing import Iterable, Iterator
 
 from app.schemas import (
     PriceSchema,
@@ -22,6 +24,8 @@ from app.schemas import (
 # Constants
 # ============================================================================
 
+_USD = Currency.USD
+
 BRANDS = [
     "Acme",
     "Contoso",
@@ -168,7 +172,7 @@ CATEGORIES = [
 # ============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class InMemoryProduct:
     """Internal product representation."""
 
@@ -187,6 +191,16 @@ class InMemoryProduct:
     in_stock: bool
     stock_quantity: int
     variants: list[dict] = field(default_factory=list)
+    # Lowercased once for list_products filters
+    brand_lower: str = field(init=False, repr=False)
+    search_blob: str = field(init=False, repr=False)  # title NUL description
+
+    def __post_init__(self) -> None:
+        """Cache lowercased brand and search text."""
+        # Interned so products share one object per brand and the brand
+        # filter's equality check is an identity hit
+        self.brand_lower = sys.intern(self.brand.lower())
+        self.search_blob = f"{self.title}\0{self.description}".lower()
 
 
 class ProductStore:
@@ -214,7 +228,15 @@ class ProductStore:
         self.products_per_category = products_per_category
         self._products: dict[str, InMemoryProduct] = {}
         self._variants: dict[str, dict] = {}  # variant_id -> variant data
+        # Indexes for list_products. Products never change after generation,
+        # so these are built once and never invalidated. Posting lists keep
+        # catalog order so unsorted pages stay stable.
+        self._by_category: dict[int, list[InMemoryProduct]] = {}
+        self._by_brand: dict[str, list[InMemoryProduct]] = {}  # lowercased
+        # Full catalog per (sort_by, sort_order), in list order
+        self._sorted: dict[tuple[str, str], list[InMemoryProduct]] = {}
         self._generate_products()
+        self._build_indexes()
 
     def _deterministic_seed(self, *args: str | int) -> int:
         """Create deterministic seed from arguments."""
@@ -234,11 +256,15 @@ class ProductStore:
 
     def _generate_products(self) -> None:
         """Generate all products."""
+        # One generator, reseeded per product rather than reallocated
+        product_rng = random.Random()
         for category in CATEGORIES:
-            rng = random.Random(self._deterministic_seed(self.seed, category["id"]))
+            # Per-category parts of the SKU and description
+            sku_prefix = f"{category['name'][:3].upper()}-{category['id']:04d}-"
+            category_lower = category["name"].lower()
 
             for i in range(self.products_per_category):
-                product_rng = random.Random(
+                product_rng.seed(
                     self._deterministic_seed(self.seed, category["id"], i)
                 )
 
@@ -249,13 +275,13 @@ class ProductStore:
                 title = template.format(brand=brand, adj=adj)
 
                 # Generate SKU
-                prefix = category["name"][:3].upper()
-                sku = f"{prefix}-{category['id']:04d}-{i:03d}"
+                sku = f"{sku_prefix}{i:03d}"
 
                 # Generate price
                 min_price, max_price = category["price_range"]
-                base_price = product_rng.randint(min_price, max_price)
-                base_price = (base_price // 100) * 100 + 99  # Round to .99
+                # Draw whole dollars and end every price in .99
+                dollars = product_rng.randint(min_price // 100, max_price // 100)
+                base_price = dollars * 100 + 99
 
                 # Generate rating
                 rating = round(product_rng.uniform(3.5, 5.0), 1)
@@ -278,7 +304,7 @@ class ProductStore:
                     id=product_id,
                     sku=sku,
                     title=title,
-                    description=f"High-quality {category['name'].lower()} from {brand}. "
+                    description=f"High-quality {category_lower} from {brand}. "
                     f"Part of our {adj.lower()} collection.",
                     brand=brand,
                     category_id=category["id"],
@@ -295,12 +321,30 @@ class ProductStore:
 
                 self._products[product_id] = product
 
-                # Index variants
+                # Index variants; the index shares the product's dicts
                 for variant in variants:
-                    self._variants[variant["id"]] = {
-                        **variant,
-                        "product_id": product_id,
-                    }
+                    variant["product_id"] = product_id
+                    self._variants[variant["id"]] = variant
+
+    def _build_indexes(self) -> None:
+        """Build category/brand posting lists and presorted catalogs."""
+        for product in self._products.values():
+            self._by_category.setdefault(product.category_id, []).append(product)
+            self._by_brand.setdefault(product.brand_lower, []).append(product)
+
+        # Stable sorts, so ties keep catalog order in both directions
+        self._sorted[("price", "asc")] = sorted(
+            self._products.values(), key=lambda p: p.base_price
+        )
+        self._sorted[("price", "desc")] = sorted(
+            self._products.values(), key=lambda p: p.base_price, reverse=True
+        )
+        self._sorted[("rating", "asc")] = sorted(
+            self._products.values(), key=lambda p: p.rating
+        )
+        self._sorted[("rating", "desc")] = sorted(
+            self._products.values(), key=lambda p: p.rating, reverse=True
+        )
 
     def _generate_variants(
         self, product_id: str, variant_type: str, rng: random.Random
@@ -401,48 +445,65 @@ class ProductStore:
         Returns:
             Tuple of (products, total_count).
         """
-        # Filter products
-        filtered = list(self._products.values())
+        brand_lower = sys.intern(brand.lower()) if brand is not None else None
+
+        # Walk a presorted catalog, or the narrowest posting list when
+        # unsorted, so no request copies or sorts the whole catalog
+        base: Iterable[InMemoryProduct]
+        if sort_by in ("price", "rating"):
+            order = "desc" if sort_order == "desc" else "asc"
+            base = self._sorted[(sort_by, order)]
+        elif category_id is not None:
+            base = self._by_category.get(category_id, [])
+            category_id = None
+        elif brand_lower is not None:
+            base = self._by_brand.get(brand_lower, [])
+            brand_lower = None
+        else:
+            base = self._products.values()
+
+        filtered = self._matching(
+            base,
+            category_id=category_id,
+            brand_lower=brand_lower,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            search_lower=search.lower() if search else None,
+        )
 
-        if category_id is not None:
-            filtered = [p for p in filtered if p.category_id == category_id]
+        # Paginate, then count the rest without building schemas
+        start = (page - 1) * page_size
+        seen = list(islice(filtered, start + page_size))
+        paginated = seen[start:]
+        total = len(seen) + sum(1 for _ in filtered)
 
-        if brand is not None:
-            filtered = [p for p in filtered if p.brand.lower() == brand.lower()]
+        return [self._to_schema(p) for p in paginated], total
 
+    def _matching(
+        self,
+        products: Iterable[InMemoryProduct],
+        category_id: int | None,
+        brand_lower: str | None,
+        min_price: int | None,
+        max_price: int | None,
+        in_stock: bool | None,
+        search_lower: str | None,
+    ) -> Iterator[InMemoryProduct]:
+        """Lazily apply list filters, preserving order."""
+        if category_id is not None:
+            products = (p for p in products if p.category_id == category_id)
+        if brand_lower is not None:
+            products = (p for p in products if p.brand_lower == brand_lower)
         if min_price is not None:
-            filtered = [p for p in filtered if p.base_price >= min_price]
-
+            products = (p for p in products if p.base_price >= min_price)
         if max_price is not None:
-            filtered = [p for p in filtered if p.base_price <= max_price]
-
+            products = (p for p in products if p.base_price <= max_price)
         if in_stock is not None:
-            filtered = [p for p in filtered if p.in_stock == in_stock]
-
-        if search:
-            search_lower = search.lower()
-            filtered = [
-                p
-                for p in filtered
-                if search_lower in p.title.lower()
-                or search_lower in p.description.lower()
-            ]
-
-        # Sort
-        if sort_by == "price":
-            filtered.sort(
-                key=lambda p: p.base_price, reverse=(sort_order == "desc")
-            )
-        elif sort_by == "rating":
-            filtered.sort(key=lambda p: p.rating, reverse=(sort_order == "desc"))
-
-        # Paginate
-        total = len(filtered)
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated = filtered[start:end]
-
-        return [self._to_schema(p) for p in paginated], total
+            products = (p for p in products if p.in_stock == in_stock)
+        if search_lower:
+            products = (p for p in products if search_lower in p.search_blob)
+        return iter(products)
 
     def _to_schema(self, product: InMemoryProduct) -> ProductSchema:
         """Convert internal product to schema."""
@@ -454,14 +515,15 @@ class ProductStore:
             brand=product.brand,
             category_id=product.category_id,
             category_path=product.category_path,
-            price=PriceSchema(amount=product.base_price, currency=Currency.USD),
+            # Nested data is generated internally, so skip its validation
+            price=PriceSchema.model_construct(amount=product.base_price, currency=_USD),
             rating=product.rating,
             review_count=product.review_count,
             image_url=product.image_url,
             in_stock=product.in_stock,
             stock_quantity=product.stock_quantity,
             variants=[
-                ProductVariantSchema(**v) for v in product.variants
+                ProductVariantSchema.model_construct(**v) for v in product.variants
             ],
         )
 
@@ -3,6 +3,7 @@
 Sends webhook notifications to CartPilot on checkout status changes.
 """
 
+import asyncio
 import hashlib
 import hmac
 import json
@@ -323,6 +324,8 @@ class WebhookSender:
 
 # Global webhook sender instance
 _webhook_sender: WebhookSender | None = None
+# Close tasks scheduled by reset_webhook_sender, held until they finish
+_closing_tasks: set["asyncio.Task[None]"] = set()
 
 
 def get_webhook_sender(
@@ -344,3 +347,43 @@ def get_webhook_sender(
     if _webhook_sender is None:
         _webhook_sender = WebhookSender(webhook_url, webhook_secret, merchant_id)
     return _webhook_sender
+
+
+def _finish_close(task: "asyncio.Task[None]") -> None:
+    """Drop a finished close task and log any error it raised."""
+    _closing_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            "Failed to close discarded webhook sender", error=str(task.exception())
+        )
+
+
+def reset_webhook_sender() -> "asyncio.Task[None] | None":
+    """Reset webhook sender instance (for testing).
+
+    Closes the discarded sender's HTTP client so its pooled connections are
+    not leaked. Without a running event loop the client is closed before
+    returning; inside one, closing is scheduled on that loop.
+
+    Returns:
+        The task closing the client when called from a running event loop
+        (await it to wait for the close), otherwise None.
+    """
+    global _webhook_sender
+    sender, _webhook_sender = _webhook_sender, None
+    if sender is None or sender._client.is_closed:
+        return None
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is None:
+        asyncio.run(sender.close())
+        return None
+
+    # Keep a reference until it finishes, or the task may be collected
+    task = loop.create_task(sender.close())
+    _closing_tasks.add(task)
+    task.add_done_callback(_finish_close)
+    return task
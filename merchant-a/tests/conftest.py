@@ -11,35 +11,67 @@ import app.webhooks as webhooks_module
 
 @pytest.fixture(autouse=True)
 def reset_stores():
-    """Reset global stores before each test."""
+    """Reset global stores before each test.
+
+    The webhook sender is reset through reset_webhook_sender so the
+    discarded sender's HTTP client is closed rather than leaked.
+    """
     products_module._product_store = None
     checkout_module._checkout_store = None
-    webhooks_module._webhook_sender = None
+    webhooks_module.reset_webhook_sender()
     yield
     products_module._product_store = None
     checkout_module._checkout_store = None
-    webhooks_module._webhook_sender = None
+    webhooks_module.reset_webhook_sender()
 
 
-@pytest.fixture
-def client():
-    """Create test client."""
+@pytest.fixture(scope="session")
+def session_client():
+    """Create one test client (and its transport) for the whole session."""
     from app.main import app
     with TestClient(app) as client:
         yield client
 
 
 @pytest.fixture
+def client(session_client):
+    """Get the shared test client; stores are reset by reset_stores."""
+    return session_client
+
+
+@pytest.fixture(scope="session")
 def product_store():
-    """Create product store for testing."""
+    """Create a small product store shared across the session.
+
+    Two products per category still gives multiple pages, brands,
+    categories and products with variants. Merchant A never mutates
+    products, so sharing the store is safe.
+    """
     from app.products import ProductStore
     return ProductStore(
         merchant_id="test-merchant",
         seed=42,
-        products_per_category=3,
+        products_per_category=2,
     )
 
 
+@pytest.fixture(scope="session")
+def large_product_store():
+    """Create a full-size product store for tests that need the catalog."""
+    from app.products import ProductStore
+    return ProductStore(
+        merchant_id="test-merchant",
+        seed=42,
+        products_per_category=5,
+    )
+
+
+@pytest.fixture
+def first_product_id(product_store):
+    """Get the first product ID from the store."""
+    return next(iter(product_store._products))
+
+
 @pytest.fixture
 def checkout_store(product_store):
     """Create checkout store for testing."""
@@ -1,5 +1,7 @@
 """Tests for Merchant A API endpoints."""
 
+from itertools import pairwise
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -93,7 +95,7 @@ class TestProductEndpoints:
         assert response.status_code == 200
         data = response.json()
         prices = [item["price"]["amount"] for item in data["items"]]
-        assert prices == sorted(prices)
+        assert all(a <= b for a, b in pairwise(prices))
 
     def test_list_products_sort_by_rating(self, client: TestClient):
         """Test sorting by rating."""
@@ -102,7 +104,7 @@ class TestProductEndpoints:
         assert response.status_code == 200
         data = response.json()
         ratings = [item["rating"] for item in data["items"]]
-        assert ratings == sorted(ratings, reverse=True)
+        assert all(a >= b for a, b in pairwise(ratings))
 
     def test_list_products_search(self, client: TestClient):
         """Test search functionality."""
@@ -178,8 +180,8 @@ class TestCheckoutEndpoints:
         )
 
         assert response.status_code == 201
-        data = response.json()
-        assert len(data["items"]) == 3
+        returned = response.json()["items"]
+        assert [r["product_id"] for r in returned] == [p["id"] for p in products]
 
     def test_create_quote_idempotency(self, client: TestClient):
         """Test idempotent quote creation."""
@@ -1,5 +1,7 @@
 """Tests for product store."""
 
+from itertools import pairwise
+
 import pytest
 
 from app.products import ProductStore
@@ -12,10 +14,11 @@ class TestProductStore:
         """Test that initialization creates products."""
         assert len(product_store._products) > 0
 
+    @pytest.mark.slow
     def test_deterministic_generation(self):
         """Test that product generation is deterministic."""
-        store1 = ProductStore(seed=123, products_per_category=2)
-        store2 = ProductStore(seed=123, products_per_category=2)
+        store1 = ProductStore(seed=123, products_per_category=1)
+        store2 = ProductStore(seed=123, products_per_category=1)
 
         # Same seeds should produce same products
         assert len(store1._products) == len(store2._products)
@@ -27,6 +30,7 @@ class TestProductStore:
             assert p1.title == p2.title
             assert p1.base_price == p2.base_price
 
+    @pytest.mark.slow
     def test_different_seeds_produce_different_products(self):
         """Test that different seeds produce different products."""
         store1 = ProductStore(seed=1, products_per_category=2)
@@ -51,12 +55,12 @@ class TestProductStore:
         product = product_store.get_product("non-existent-id")
         assert product is None
 
-    def test_list_products_pagination(self, product_store: ProductStore):
+    def test_list_products_pagination(self, large_product_store: ProductStore):
         """Test product listing with pagination."""
-        products, total = product_store.list_products(page=1, page_size=5)
+        products, total = large_product_store.list_products(page=1, page_size=5)
 
-        assert len(products) <= 5
-        assert total > 0
+        assert len(products) == 5
+        assert total > 5
 
     def test_list_products_filter_by_brand(self, product_store: ProductStore):
         """Test filtering products by brand."""
@@ -110,10 +114,10 @@ class TestProductStore:
 
         if len(products_asc) > 1:
             prices_asc = [p.price.amount for p in products_asc]
-            assert prices_asc == sorted(prices_asc)
+            assert all(a <= b for a, b in pairwise(prices_asc))
 
             prices_desc = [p.price.amount for p in products_desc]
-            assert prices_desc == sorted(prices_desc, reverse=True)
+            assert all(a >= b for a, b in pairwise(prices_desc))
 
     def test_list_products_sort_by_rating(self, product_store: ProductStore):
         """Test sorting products by rating."""
@@ -123,42 +127,49 @@ class TestProductStore:
 
         if len(products_desc) > 1:
             ratings = [p.rating for p in products_desc]
-            assert ratings == sorted(ratings, reverse=True)
-
-    def test_get_effective_price_without_variant(self, product_store: ProductStore):
-        """Test getting effective price without variant."""
-        product_id = list(product_store._products.keys())[0]
-        product = product_store._products[product_id]
-
-        price = product_store.get_effective_price(product_id)
-
-        assert price == product.base_price
-
-    def test_get_effective_price_with_variant(self, product_store: ProductStore):
-        """Test getting effective price with variant."""
-        # Find a product with variants
-        for product in product_store._products.values():
-            if product.variants:
-                variant = product.variants[0]
-                price = product_store.get_effective_price(
-                    product.id, variant["id"]
-                )
-                expected = product.base_price + variant["price_modifier"]
-                assert price == expected
-                return
-
-    def test_check_stock_available(self, product_store: ProductStore):
-        """Test stock check for available product."""
-        product_id = list(product_store._products.keys())[0]
+            assert all(a >= b for a, b in pairwise(ratings))
+
+    @pytest.mark.parametrize("with_variant", [False, True])
+    def test_get_effective_price(
+        self, product_store: ProductStore, with_variant: bool
+    ):
+        """Test getting effective price with and without a variant."""
+        product = next(
+            p for p in product_store._products.values()
+            if p.variants or not with_variant
+        )
+        variant = product.variants[0] if with_variant else None
 
-        # Should have stock (happy path merchant)
-        result = product_store.check_stock(product_id, None, 1)
-        assert result is True
+        price = product_store.get_effective_price(
+            product.id, variant["id"] if variant else None
+        )
 
-    def test_check_stock_not_found(self, product_store: ProductStore):
-        """Test stock check for non-existent product."""
-        result = product_store.check_stock("non-existent", None, 1)
-        assert result is False
+        expected = product.base_price
+        if variant:
+            expected += variant["price_modifier"]
+        assert price == expected
+
+    @pytest.mark.parametrize(
+        "product_id,variant_id,quantity,expected",
+        [
+            ("real", None, 1, True),  # Happy path merchant has stock
+            ("non-existent", None, 1, False),
+        ],
+    )
+    def test_check_stock(
+        self,
+        product_store: ProductStore,
+        first_product_id: str,
+        product_id: str,
+        variant_id: str | None,
+        quantity: int,
+        expected: bool,
+    ):
+        """Test stock check for existing and non-existent products."""
+        product_id = first_product_id if product_id == "real" else product_id
+
+        result = product_store.check_stock(product_id, variant_id, quantity)
+        assert result is expected
 
     def test_products_have_high_inventory(self, product_store: ProductStore):
         """Test that products have high inventory (happy path)."""
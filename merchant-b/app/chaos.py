@@ -4,10 +4,12 @@ Manages chaos mode configuration and scenario triggering.
 """
 
 import random
-import uuid
+from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
+from uuid import uuid4 as _uuid4
 
 import structlog
 
@@ -21,8 +23,10 @@ from app.schemas import (
 
 logger = structlog.get_logger()
 
+_UTC = timezone.utc
 
-@dataclass
+
+@dataclass(slots=True)
 class ChaosConfig:
     """Configuration for chaos mode."""
 
@@ -51,11 +55,65 @@ class ChaosController:
 
     MAX_EVENT_LOG_SIZE = 100
 
+    # Fixed trigger probabilities when a scenario is enabled.
+    # OUT_OF_STOCK uses the configurable out_of_stock_probability instead.
+    TRIGGER_PROBABILITIES: dict[ChaosScenario, float] = {
+        ChaosScenario.PRICE_CHANGE: 0.5,
+        ChaosScenario.DUPLICATE_WEBHOOK: 0.7,
+        ChaosScenario.DELAYED_WEBHOOK: 0.6,
+        ChaosScenario.OUT_OF_ORDER_WEBHOOK: 0.4,
+    }
+
+    WEBHOOK_SCENARIOS = frozenset({
+        ChaosScenario.DUPLICATE_WEBHOOK,
+        ChaosScenario.DELAYED_WEBHOOK,
+        ChaosScenario.OUT_OF_ORDER_WEBHOOK,
+    })
+
     def __init__(self) -> None:
         """Initialize chaos controller."""
         self.config = ChaosConfig()
-        self._event_log: list[ChaosEventLog] = []
+        self._event_log: deque[ChaosEventLog] = deque(
+            maxlen=self.MAX_EVENT_LOG_SIZE
+        )
+        # Secondary indexes over _event_log, kept in the same time order
+        self._events_by_scenario: dict[ChaosScenario, deque[ChaosEventLog]] = {}
+        self._events_by_checkout: dict[str, deque[ChaosEventLog]] = {}
         self._rng = random.Random()
+        # Trigger thresholds for enabled scenarios only (empty when chaos is
+        # off), so should_trigger resolves enabled + probability in one lookup
+        self._thresholds: dict[ChaosScenario, float] = {}
+        # Whether any webhook scenario can trigger; lets the webhook sender
+        # skip its chaos checks entirely on the common no-chaos path
+        self.webhook_chaos_active = False
+        # Last built get_config() response
+        self._cached_config: ChaosConfigResponse | None = None
+        self._config_changed()
+
+    @property
+    def event_count(self) -> int:
+        """Number of events currently in the event log."""
+        return len(self._event_log)
+
+    def _config_changed(self) -> None:
+        """Rebuild derived state after any change to the config."""
+        config = self.config
+        if config.enabled:
+            probabilities = {
+                **self.TRIGGER_PROBABILITIES,
+                ChaosScenario.OUT_OF_STOCK: config.out_of_stock_probability,
+            }
+            self._thresholds = {
+                scenario: probability
+                for scenario, probability in probabilities.items()
+                if config.scenarios.get(scenario, False)
+            }
+        else:
+            self._thresholds = {}
+        self.webhook_chaos_active = not self.WEBHOOK_SCENARIOS.isdisjoint(
+            self._thresholds
+        )
+        self._cached_config = None
 
     def configure(self, request: ChaosConfigRequest) -> ChaosConfigResponse:
         """Configure chaos mode settings.
@@ -78,6 +136,7 @@ class ChaosController:
 
         # Auto-enable if any scenario is enabled
         self.config.enabled = any(self.config.scenarios.values())
+        self._config_changed()
 
         logger.info(
             "Chaos mode configured",
@@ -93,14 +152,16 @@ class ChaosController:
         Returns:
             Current configuration.
         """
-        return ChaosConfigResponse(
-            enabled=self.config.enabled,
-            scenarios=self.config.scenarios,
-            price_change_percent=self.config.price_change_percent,
-            out_of_stock_probability=self.config.out_of_stock_probability,
-            duplicate_webhook_count=self.config.duplicate_webhook_count,
-            webhook_delay_seconds=self.config.webhook_delay_seconds,
-        )
+        if self._cached_config is None:
+            self._cached_config = ChaosConfigResponse(
+                enabled=self.config.enabled,
+                scenarios=self.config.scenarios,
+                price_change_percent=self.config.price_change_percent,
+                out_of_stock_probability=self.config.out_of_stock_probability,
+                duplicate_webhook_count=self.config.duplicate_webhook_count,
+                webhook_delay_seconds=self.config.webhook_delay_seconds,
+            )
+        return self._cached_config
 
     def enable_all(self) -> ChaosConfigResponse:
         """Enable all chaos scenarios.
@@ -111,6 +172,7 @@ class ChaosController:
         for scenario in ChaosScenario:
             self.config.scenarios[scenario] = True
         self.config.enabled = True
+        self._config_changed()
 
         logger.info("All chaos scenarios enabled")
 
@@ -125,6 +187,7 @@ class ChaosController:
         for scenario in ChaosScenario:
             self.config.scenarios[scenario] = False
         self.config.enabled = False
+        self._config_changed()
 
         logger.info("All chaos scenarios disabled")
 
@@ -141,6 +204,7 @@ class ChaosController:
         """
         self.config.scenarios[scenario] = True
         self.config.enabled = True
+        self._config_changed()
 
         logger.info("Chaos scenario enabled", scenario=scenario.value)
 
@@ -157,6 +221,7 @@ class ChaosController:
         """
         self.config.scenarios[scenario] = False
         self.config.enabled = any(self.config.scenarios.values())
+        self._config_changed()
 
         logger.info("Chaos scenario disabled", scenario=scenario.value)
 
@@ -173,33 +238,15 @@ class ChaosController:
         Returns:
             True if scenario should trigger.
         """
-        if not self.config.enabled:
+        threshold = self._thresholds.get(scenario)
+        if threshold is None:
             return False
 
-        if not self.config.scenarios.get(scenario, False):
-            return False
-
-        # Different probabilities for different scenarios
-        if scenario == ChaosScenario.PRICE_CHANGE:
-            # 50% chance when enabled
-            return self._rng.random() < 0.5
-
-        elif scenario == ChaosScenario.OUT_OF_STOCK:
-            return self._rng.random() < self.config.out_of_stock_probability
-
-        elif scenario == ChaosScenario.DUPLICATE_WEBHOOK:
-            # 70% chance when enabled
-            return self._rng.random() < 0.7
-
-        elif scenario == ChaosScenario.DELAYED_WEBHOOK:
-            # 60% chance when enabled
-            return self._rng.random() < 0.6
-
-        elif scenario == ChaosScenario.OUT_OF_ORDER_WEBHOOK:
-            # 40% chance when enabled
-            return self._rng.random() < 0.4
-
-        return False
+        # Only draw from the RNG when the outcome is actually uncertain;
+        # random() is in [0, 1), so a threshold of 1.0 always triggers.
+        if threshold >= 1.0:
+            return True
+        return threshold > 0 and self._rng.random() < threshold
 
     def force_trigger(self, scenario: ChaosScenario) -> bool:
         """Force a chaos scenario to trigger immediately.
@@ -235,18 +282,21 @@ class ChaosController:
             Created event log entry.
         """
         event = ChaosEventLog(
-            id=str(uuid.uuid4()),
+            id=str(_uuid4()),
             scenario=scenario,
             checkout_id=checkout_id,
             details=details,
-            triggered_at=datetime.now(timezone.utc),
+            triggered_at=datetime.now(_UTC),
         )
 
+        # Bounded deque evicts the oldest event once the log is full;
+        # drop it from the secondary indexes first so they stay in sync
+        if len(self._event_log) == self.MAX_EVENT_LOG_SIZE:
+            self._unindex_event(self._event_log[0])
         self._event_log.append(event)
-
-        # Trim log if too large
-        if len(self._event_log) > self.MAX_EVENT_LOG_SIZE:
-            self._event_log = self._event_log[-self.MAX_EVENT_LOG_SIZE:]
+        self._events_by_scenario.setdefault(scenario, deque()).append(event)
+        if checkout_id:
+            self._events_by_checkout.setdefault(checkout_id, deque()).append(event)
 
         logger.info(
             "Chaos event logged",
@@ -257,6 +307,23 @@ class ChaosController:
 
         return event
 
+    def _unindex_event(self, event: ChaosEventLog) -> None:
+        """Remove the oldest logged event from the secondary indexes.
+
+        Args:
+            event: Event about to be evicted from the log.
+        """
+        by_scenario = self._events_by_scenario[event.scenario]
+        by_scenario.popleft()
+        if not by_scenario:
+            del self._events_by_scenario[event.scenario]
+
+        if event.checkout_id:
+            by_checkout = self._events_by_checkout[event.checkout_id]
+            by_checkout.popleft()
+            if not by_checkout:
+                del self._events_by_checkout[event.checkout_id]
+
     def get_events(
         self,
         limit: int = 50,
@@ -273,20 +340,21 @@ class ChaosController:
         Returns:
             Event log response.
         """
-        events = self._event_log.copy()
-
-        # Apply filters
-        if scenario:
-            events = [e for e in events if e.scenario == scenario]
-
+        # Start from the most selective index. Events are appended in time
+        # order, so iterating in reverse yields most recent first; any
+        # remaining filter is applied lazily and stops once limit is reached.
+        # Empty filters are ignored, as they always have been.
         if checkout_id:
-            events = [e for e in events if e.checkout_id == checkout_id]
+            recent = reversed(self._events_by_checkout.get(checkout_id, ()))
+            if scenario:
+                recent = filter(lambda e: e.scenario == scenario, recent)
+        elif scenario:
+            recent = reversed(self._events_by_scenario.get(scenario, ()))
+        else:
+            # Unfiltered dashboards just want the tail of the log
+            recent = reversed(self._event_log)
 
-        # Sort by most recent first
-        events.sort(key=lambda e: e.triggered_at, reverse=True)
-
-        # Apply limit
-        events = events[:limit]
+        events = list(islice(recent, limit))
 
         return ChaosEventsResponse(
             events=events,
@@ -301,6 +369,8 @@ class ChaosController:
         """
         count = len(self._event_log)
         self._event_log.clear()
+        self._events_by_scenario.clear()
+        self._events_by_checkout.clear()
         logger.info("Chaos event log cleared", count=count)
         return count
 
@@ -318,12 +388,52 @@ class ChaosController:
         self.config.out_of_stock_probability = 0.3
         self.config.duplicate_webhook_count = 3
         self.config.webhook_delay_seconds = 5.0
+        self._config_changed()
 
         logger.info("Chaos controller reset")
 
         return self.get_config()
 
 
+class NullChaosController:
+    """Chaos controller stand-in that never triggers anything.
+
+    Used as the default so callers can invoke the controller without
+    checking for None first.
+    """
+
+    webhook_chaos_active = False
+
+    def __init__(self) -> None:
+        """Initialize with a disabled configuration."""
+        self.config = ChaosConfig()
+
+    def should_trigger(self, scenario: ChaosScenario) -> bool:
+        """Never trigger.
+
+        Args:
+            scenario: Scenario to check.
+
+        Returns:
+            Always False.
+        """
+        return False
+
+    def log_event(
+        self,
+        scenario: ChaosScenario,
+        checkout_id: str | None,
+        details: dict[str, Any],
+    ) -> None:
+        """Discard the event.
+
+        Args:
+            scenario: Triggered scenario.
+            checkout_id: Related checkout ID.
+            details: Event details.
+        """
+
+
 # Global chaos controller instance
 _chaos_controller: ChaosController | None = None
 
@@ -5,12 +5,15 @@ with chaos mode behaviors: price changes and out-of-stock scenarios.
 """
 
 import hashlib
+import os
 import random
-import uuid
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any, Callable
+from uuid import uuid4 as _uuid4
 
+from app.chaos import NullChaosController
 from app.products import ProductStore, get_product_store
 from app.schemas import (
     ChaosScenario,
@@ -26,13 +29,16 @@ from app.schemas import (
 if TYPE_CHECKING:
     from app.chaos import ChaosController
 
+_USD = Currency.USD
+_UTC = timezone.utc
+
 
 # ============================================================================
 # Checkout Session
 # ============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckoutItem:
     """Internal checkout item representation."""
 
@@ -43,14 +49,18 @@ class CheckoutItem:
     unit_price: int  # in cents - price at quote time
     quantity: int
     currency: str = "USD"
+    # in cents - unit_price * quantity, derived once at quote time
+    line_total: int = field(default=0, init=False)
+    # Immutable identity part of this item's receipt hash line
+    _receipt_prefix: str = field(default="", init=False, repr=False)
 
-    @property
-    def line_total(self) -> int:
-        """Calculate line total in cents."""
-        return self.unit_price * self.quantity
+    def __post_init__(self) -> None:
+        """Derive the line total and cache the receipt hash prefix."""
+        self.line_total = self.unit_price * self.quantity
+        self._receipt_prefix = f"{self.product_id}:{self.variant_id or ''}:"
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckoutSession:
     """Internal checkout session representation."""
 
@@ -74,6 +84,11 @@ class CheckoutSession:
     original_prices: dict[str, int] = field(default_factory=dict)  # product_id -> price
     chaos_triggered: list[str] = field(default_factory=list)
 
+    @property
+    def expires_epoch(self) -> float | None:
+        """``expires_at`` as a POSIX timestamp, so expiry checks compare floats."""
+        return None if self.expires_at is None else self.expires_at.timestamp()
+
 
 # ============================================================================
 # Checkout Store
@@ -96,20 +111,28 @@ class CheckoutStore:
     def __init__(
         self,
         product_store: ProductStore | None = None,
-        chaos_controller: "ChaosController | None" = None,
+        chaos_controller: "ChaosController | NullChaosController | None" = None,
     ) -> None:
         """Initialize checkout store.
 
         Args:
             product_store: Product store instance.
             chaos_controller: Chaos controller for triggering scenarios.
+                Defaults to a controller that never triggers.
         """
         self.product_store = product_store or get_product_store()
-        self.chaos_controller = chaos_controller
+        self.chaos_controller = chaos_controller or NullChaosController()
         self._sessions: dict[str, CheckoutSession] = {}
         self._idempotency_cache: dict[str, str] = {}  # key -> checkout_id
 
-    def set_chaos_controller(self, controller: "ChaosController") -> None:
+    @property
+    def checkout_count(self) -> int:
+        """Number of checkout sessions in the store."""
+        return len(self._sessions)
+
+    def set_chaos_controller(
+        self, controller: "ChaosController | NullChaosController"
+    ) -> None:
         """Set the chaos controller.
 
         Args:
@@ -119,12 +142,16 @@ class CheckoutStore:
 
     def _generate_checkout_id(self) -> str:
         """Generate unique checkout ID."""
-        return str(uuid.uuid4())
+        return str(_uuid4())
 
-    def _generate_order_id(self) -> str:
-        """Generate merchant order ID."""
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-        random_part = uuid.uuid4().hex[:8].upper()
+    def _generate_order_id(self, now_ts: float | None = None) -> str:
+        """Generate merchant order ID.
+
+        Args:
+            now_ts: Current POSIX timestamp, to avoid reading the clock again.
+        """
+        timestamp = time.strftime("%Y%m%d%H%M%S", time.gmtime(now_ts))
+        random_part = os.urandom(4).hex().upper()
         return f"ORD-{timestamp}-{random_part}"
 
     def _calculate_receipt_hash(self, session: CheckoutSession) -> str:
@@ -136,18 +163,20 @@ class CheckoutStore:
         Returns:
             Hash of receipt data.
         """
-        data = "|".join(
+        # Only 64 bits are kept, so use an 8-byte BLAKE2b digest rather than
+        # truncating SHA-256. The payload is joined and encoded once so the
+        # hasher is fed with a single C call instead of one per item; each
+        # item's ID part is formatted once at construction.
+        payload = "".join(
             [
-                session.id,
-                str(session.total),
-                session.currency,
-                ",".join(
-                    f"{item.product_id}:{item.variant_id or ''}:{item.quantity}:{item.unit_price}"
+                f"{session.id}|{session.total}|{session.currency}|",
+                *(
+                    f"{item._receipt_prefix}{item.quantity}:{item.unit_price},"
                     for item in session.items
                 ),
             ]
         )
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
 
     def create_quote(
         self,
@@ -175,60 +204,48 @@ class CheckoutStore:
             if existing:
                 return existing
 
-        # Build checkout items
+        # Build checkout items and accumulate the subtotal in one pass
         checkout_items: list[CheckoutItem] = []
         original_prices: dict[str, int] = {}
+        subtotal = 0
+        get_product_bundle = self.product_store.get_product_bundle
 
         for item_req in items:
-            product = self.product_store.get_product(item_req.product_id)
-            if not product:
-                raise ValueError(f"Product not found: {item_req.product_id}")
-
-            # Check stock
-            if not self.product_store.check_stock(
-                item_req.product_id, item_req.variant_id, item_req.quantity
-            ):
-                raise ValueError(
-                    f"Insufficient stock for product: {item_req.product_id}"
-                )
+            product_id = item_req.product_id
+            variant_id = item_req.variant_id
+            quantity = item_req.quantity
 
-            # Get effective price
-            unit_price = self.product_store.get_effective_price(
-                item_req.product_id, item_req.variant_id
-            )
-            if unit_price is None:
-                raise ValueError(f"Could not determine price for: {item_req.product_id}")
+            bundle = get_product_bundle(product_id, variant_id, quantity)
+            if bundle is None:
+                raise ValueError(f"Product not found: {product_id}")
+            product, variant, unit_price, stock_ok = bundle
+
+            if not stock_ok:
+                raise ValueError(f"Insufficient stock for product: {product_id}")
 
             # Store original price for chaos detection
-            original_prices[item_req.product_id] = unit_price
-
-            # Get SKU
-            sku = product.sku
-            if item_req.variant_id:
-                variant = self.product_store.get_variant(item_req.variant_id)
-                if variant:
-                    sku = f"{product.sku}{variant['sku_suffix']}"
-
-            checkout_items.append(
-                CheckoutItem(
-                    product_id=item_req.product_id,
-                    variant_id=item_req.variant_id,
-                    sku=sku,
-                    title=product.title,
-                    unit_price=unit_price,
-                    quantity=item_req.quantity,
-                    currency=product.price.currency.value,
-                )
+            original_prices[product_id] = unit_price
+
+            sku = f"{product.sku}{variant['sku_suffix']}" if variant else product.sku
+            item = CheckoutItem(
+                product_id=product_id,
+                variant_id=variant_id,
+                sku=sku,
+                title=product.title,
+                unit_price=unit_price,
+                quantity=quantity,
+                currency=product.currency,
             )
+            subtotal += item.line_total
+            checkout_items.append(item)
 
         # Calculate totals
-        subtotal = sum(item.line_total for item in checkout_items)
         tax = int(subtotal * self.TAX_RATE)
         shipping = 0 if subtotal >= self.FREE_SHIPPING_THRESHOLD else self.SHIPPING_FLAT
         total = subtotal + tax + shipping
 
         # Create session
-        now = datetime.now(timezone.utc)
+        now = datetime.now(_UTC)
         session = CheckoutSession(
             id=self._generate_checkout_id(),
             status=CheckoutStatus.QUOTED,
@@ -260,71 +277,78 @@ class CheckoutStore:
 
         return session
 
-    def get_checkout(self, checkout_id: str) -> CheckoutSession | None:
+    def _is_expired(self, session: CheckoutSession, now_ts: float) -> bool:
+        """Check whether a session has passed its expiration time.
+
+        Args:
+            session: Checkout session.
+            now_ts: Current time as a POSIX timestamp.
+
+        Returns:
+            True if the session has expired.
+        """
+        expires = session.expires_epoch
+        return expires is not None and now_ts > expires
+
+    def get_checkout(
+        self, checkout_id: str, now: datetime | None = None
+    ) -> CheckoutSession | None:
         """Get checkout session by ID.
 
         Args:
             checkout_id: Checkout ID.
+            now: Current time, if the caller has already read the clock.
 
         Returns:
             Checkout session or None.
         """
         session = self._sessions.get(checkout_id)
         if session:
+            now_ts = time.time() if now is None else now.timestamp()
             # Check expiration
-            if session.expires_at and datetime.now(timezone.utc) > session.expires_at:
+            if self._is_expired(session, now_ts):
                 session.status = CheckoutStatus.EXPIRED
-                session.updated_at = datetime.now(timezone.utc)
+                session.updated_at = now or datetime.fromtimestamp(now_ts, _UTC)
         return session
 
-    def _check_for_price_changes(self, session: CheckoutSession) -> list[dict]:
-        """Check if any prices have changed since quote.
-
-        Args:
-            session: Checkout session.
-
-        Returns:
-            List of price change details.
-        """
-        changes = []
-
-        for item in session.items:
-            current_price = self.product_store.get_effective_price(
-                item.product_id, item.variant_id
-            )
-            if current_price is None:
-                continue
-
-            quoted_price = item.unit_price
-            if current_price != quoted_price:
-                changes.append(
-                    {
-                        "product_id": item.product_id,
-                        "variant_id": item.variant_id,
-                        "quoted_price": quoted_price,
-                        "current_price": current_price,
-                        "difference": current_price - quoted_price,
-                    }
-                )
-
-        return changes
+    def _check_for_problems(
+        self, session: CheckoutSession
+    ) -> tuple[list[dict], list[dict]]:
+        """Check for price changes and stock issues since quote.
 
-    def _check_for_stock_issues(self, session: CheckoutSession) -> list[dict]:
-        """Check if any items are now out of stock.
+        Each item is resolved against the product store once and used for
+        both checks.
 
         Args:
             session: Checkout session.
 
         Returns:
-            List of stock issue details.
+            Tuple of (price change details, stock issue details).
         """
-        issues = []
+        price_changes: list[dict] = []
+        stock_issues: list[dict] = []
+        get_product_bundle = self.product_store.get_product_bundle
 
         for item in session.items:
-            if not self.product_store.check_stock(
-                item.product_id, item.variant_id, item.quantity
-            ):
-                issues.append(
+            bundle = get_product_bundle(item.product_id, item.variant_id, item.quantity)
+            if bundle is None:
+                stock_ok = False
+            else:
+                _, _, current_price, stock_ok = bundle
+                quoted_price = item.unit_price
+                if current_price != quoted_price:
+                    price_changes.append(
+                        {
+                            "product_id": item.product_id,
+                            "variant_id": item.variant_id,
+                            "quoted_price": quoted_price,
+                            "current_price": current_price,
+                            "difference": current_price - quoted_price,
+                        }
+                    )
+
+            if not stock_ok:
+                stock_issues.append(
                     {
                         "product_id": item.product_id,
                         "variant_id": item.variant_id,
@@ -332,7 +356,7 @@ class CheckoutStore:
                     }
                 )
 
-        return issues
+        return price_changes, stock_issues
 
     def confirm_checkout(
         self,
@@ -357,7 +381,9 @@ class CheckoutStore:
         Raises:
             ValueError: If checkout not found, expired, or chaos triggered.
         """
-        session = self.get_checkout(checkout_id)
+        now_ts = time.time()
+        now = datetime.fromtimestamp(now_ts, _UTC)
+        session = self.get_checkout(checkout_id, now)
         if not session:
             raise ValueError(f"Checkout not found: {checkout_id}")
 
@@ -372,31 +398,30 @@ class CheckoutStore:
             )
 
         # Check expiration
-        if session.expires_at and datetime.now(timezone.utc) > session.expires_at:
+        if self._is_expired(session, now_ts):
             session.status = CheckoutStatus.EXPIRED
-            session.updated_at = datetime.now(timezone.utc)
+            session.updated_at = now
             raise ValueError("Checkout has expired")
 
         # CHAOS MODE: Trigger scenarios before confirmation
-        if self.chaos_controller:
-            self._trigger_chaos_before_confirm(session)
+        self._trigger_chaos_before_confirm(session)
+
+        price_changes, stock_issues = self._check_for_problems(session)
 
         # Check for stock issues (chaos may have triggered out-of-stock)
-        stock_issues = self._check_for_stock_issues(session)
         if stock_issues:
             session.status = CheckoutStatus.FAILED
             session.failure_reason = "OUT_OF_STOCK"
-            session.updated_at = datetime.now(timezone.utc)
+            session.updated_at = now
             session.chaos_triggered.append("out_of_stock")
             products = ", ".join(i["product_id"][:8] for i in stock_issues)
             raise ValueError(f"Items out of stock: {products}")
 
         # Check for price changes (chaos may have triggered price change)
-        price_changes = self._check_for_price_changes(session)
         if price_changes:
             session.status = CheckoutStatus.FAILED
             session.failure_reason = "PRICE_CHANGED"
-            session.updated_at = datetime.now(timezone.utc)
+            session.updated_at = now
             session.chaos_triggered.append("price_change")
             # Build detailed error message
             details = []
@@ -411,13 +436,13 @@ class CheckoutStore:
         if current_hash != session.receipt_hash:
             session.status = CheckoutStatus.FAILED
             session.failure_reason = "RECEIPT_MISMATCH"
-            session.updated_at = datetime.now(timezone.utc)
+            session.updated_at = now
             raise ValueError("Receipt mismatch, re-quote required")
 
         # Success - confirm checkout
         session.status = CheckoutStatus.CONFIRMED
-        session.merchant_order_id = self._generate_order_id()
-        session.updated_at = datetime.now(timezone.utc)
+        session.merchant_order_id = self._generate_order_id(now_ts)
+        session.updated_at = now
 
         return session
 
@@ -427,19 +452,28 @@ class CheckoutStore:
         Args:
             session: Checkout session to potentially disrupt.
         """
-        if not self.chaos_controller:
+        chaos = self.chaos_controller
+        if not chaos.config.enabled:
+            return
+
+        # Resolve which scenarios can fire once, so a disabled scenario costs
+        # nothing per item (no dict lookup, no RNG draw)
+        scenarios = chaos.config.scenarios
+        do_price_change = scenarios.get(ChaosScenario.PRICE_CHANGE, False)
+        do_out_of_stock = scenarios.get(ChaosScenario.OUT_OF_STOCK, False)
+        if not (do_price_change or do_out_of_stock):
             return
 
         # Check each item for potential chaos
         for item in session.items:
             # Price change chaos
-            if self.chaos_controller.should_trigger(ChaosScenario.PRICE_CHANGE):
+            if do_price_change and chaos.should_trigger(ChaosScenario.PRICE_CHANGE):
                 result = self.product_store.trigger_price_change(
                     item.product_id, increase=True
                 )
                 if result:
                     old_price, new_price = result
-                    self.chaos_controller.log_event(
+                    chaos.log_event(
                         ChaosScenario.PRICE_CHANGE,
                         session.id,
                         {
@@ -450,12 +484,12 @@ class CheckoutStore:
                     )
 
             # Out of stock chaos
-            if self.chaos_controller.should_trigger(ChaosScenario.OUT_OF_STOCK):
+            if do_out_of_stock and chaos.should_trigger(ChaosScenario.OUT_OF_STOCK):
                 success = self.product_store.trigger_out_of_stock(
                     item.product_id, item.variant_id
                 )
                 if success:
-                    self.chaos_controller.log_event(
+                    chaos.log_event(
                         ChaosScenario.OUT_OF_STOCK,
                         session.id,
                         {
@@ -483,7 +517,7 @@ class CheckoutStore:
 
         session.status = CheckoutStatus.FAILED
         session.failure_reason = reason
-        session.updated_at = datetime.now(timezone.utc)
+        session.updated_at = datetime.now(_UTC)
 
         return session
 
@@ -496,29 +530,33 @@ class CheckoutStore:
         Returns:
             Checkout schema.
         """
-        return CheckoutSchema(
-            id=session.id,
-            status=session.status,
-            items=[
-                CheckoutItemSchema(
+        # Values come from our own session state, so skip pydantic
+        # validation for the nested price/item models.
+        price = PriceSchema.model_construct
+        item_schema = CheckoutItemSchema.model_construct
+        items = []
+        for item in session.items:
+            currency = _USD if item.currency == "USD" else Currency(item.currency)
+            items.append(
+                item_schema(
                     product_id=item.product_id,
                     variant_id=item.variant_id,
                     sku=item.sku,
                     title=item.title,
-                    unit_price=PriceSchema(
-                        amount=item.unit_price, currency=Currency(item.currency)
-                    ),
+                    unit_price=price(amount=item.unit_price, currency=currency),
                     quantity=item.quantity,
-                    line_total=PriceSchema(
-                        amount=item.line_total, currency=Currency(item.currency)
-                    ),
+                    line_total=price(amount=item.line_total, currency=currency),
                 )
-                for item in session.items
-            ],
-            subtotal=PriceSchema(amount=session.subtotal, currency=Currency.USD),
-            tax=PriceSchema(amount=session.tax, currency=Currency.USD),
-            shipping=PriceSchema(amount=session.shipping, currency=Currency.USD),
-            total=PriceSchema(amount=session.total, currency=Currency.USD),
+            )
+
+        return CheckoutSchema(
+            id=session.id,
+            status=session.status,
+            items=items,
+            subtotal=price(amount=session.subtotal, currency=_USD),
+            tax=price(amount=session.tax, currency=_USD),
+            shipping=price(amount=session.shipping, currency=_USD),
+            total=price(amount=session.total, currency=_USD),
             customer_email=session.customer_email,
             receipt_hash=session.receipt_hash,
             merchant_order_id=session.merchant_order_id,
@@ -12,19 +12,35 @@ Chaos Scenarios:
 - OUT_OF_ORDER_WEBHOOK: Webhooks sent in wrong sequence
 """
 
+import asyncio
+import hashlib
+import logging
+import logging.handlers
+import operator
+import queue
+import sys
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Annotated, Any
+from functools import lru_cache
+from typing import Annotated, Any, Awaitable, Callable
+from uuid import uuid4
 
-from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Query, status
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi import Depends, FastAPI, HTTPException, Path, Query, Request, status
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
 from pydantic_settings import BaseSettings
+from starlette.types import ASGIApp, Receive, Scope, Send
 import structlog
+from structlog.contextvars import bind_contextvars, clear_contextvars
 
 from app.chaos import ChaosController, get_chaos_controller
 from app.checkout import CheckoutStore, get_checkout_store
-from app.products import ProductStore, get_product_store
+from app.products import (
+    ProductStore,
+    decode_cursor,
+    encode_cursor,
+    get_product_store,
+)
 from app.schemas import (
     ChaosConfigRequest,
     ChaosConfigResponse,
@@ -60,6 +76,12 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     products_per_category: int = 5
     random_seed: int = 43  # Different from merchant-a
+    products_max_total: int = 10000  # cap on /products total counting
+    products_page_cache_size: int = 512  # memoized /products result pages
+    webhook_workers: int = 8
+    webhook_queue_size: int = 1000
+    webhook_max_attempts: int = 3  # per webhook, including the first send
+    webhook_supports_batch: bool = False  # receiver has <webhook_url>/batch
 
     model_config = {
         "env_file": ".env",
@@ -67,7 +89,56 @@ class Settings(BaseSettings):
     }
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get settings, reading the environment and ``.env`` only once."""
+    return Settings()
+
+
+settings = get_settings()
+
+# Log records are handed to a queue on the request path and written to
+# stderr by the listener thread, started and stopped with the app lifespan
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, logging.StreamHandler(sys.stderr)
+)
+# Every structlog logger writes through this one stdlib logger. It does not
+# propagate, so the root logger and third-party libraries (httpx logs each
+# request at INFO) keep their own levels and never reach the JSON stream.
+_app_logger = logging.getLogger("merchant_b")
+
+
+def configure_logging() -> None:
+    """Configure structlog to drop sub-threshold calls before processing.
+
+    The filtering bound logger turns calls below ``settings.log_level`` into
+    no-ops, so they never build an event dict or run the processor chain.
+    Rendered lines go through a dedicated stdlib logger to a
+    ``QueueHandler`` so the event loop never blocks on the stderr write; the
+    root logger is left alone.
+    """
+    level = getattr(logging, settings.log_level.upper())
+    if not _app_logger.handlers:
+        _app_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _app_logger.setLevel(level)
+    _app_logger.propagate = False
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(),
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        logger_factory=lambda *args: _app_logger,
+        cache_logger_on_first_use=True,
+    )
+
+
+configure_logging()
 logger = structlog.get_logger()
 
 
@@ -76,10 +147,36 @@ logger = structlog.get_logger()
 # ============================================================================
 
 
+# A queued unit of webhook work: WebhookSender.send_* calls with their
+# keyword args, delivered in order by a single worker
+WebhookJob = list[tuple[Callable[..., Awaitable[bool]], dict[str, Any]]]
+
+
+async def _webhook_worker(webhook_queue: "asyncio.Queue[WebhookJob]") -> None:
+    """Deliver queued webhooks until cancelled.
+
+    Args:
+        webhook_queue: Queue of pending webhook jobs.
+    """
+    while True:
+        job = await webhook_queue.get()
+        try:
+            for send, kwargs in job:
+                try:
+                    await send(**kwargs)
+                except Exception:
+                    logger.exception(
+                        "Webhook worker send failed", send=send.__name__
+                    )
+        finally:
+            webhook_queue.task_done()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
+    _log_listener.start()
     logger.info(
         "Starting Merchant B Simulator (Chaos Mode)",
         merchant_id=settings.merchant_id,
@@ -103,6 +200,8 @@ async def lifespan(app: FastAPI):
         webhook_url=settings.webhook_url,
         webhook_secret=settings.webhook_secret,
         merchant_id=settings.merchant_id,
+        max_attempts=settings.webhook_max_attempts,
+        supports_batch=settings.webhook_supports_batch,
     )
     webhook_sender.set_chaos_controller(chaos_controller)
 
@@ -110,11 +209,27 @@ async def lifespan(app: FastAPI):
     if settings.chaos_enabled:
         chaos_controller.enable_all()
 
+    # Webhook fan-out runs on a fixed worker pool, decoupled from requests;
+    # the bounded queue applies backpressure to handlers when it fills up
+    webhook_queue: asyncio.Queue[WebhookJob] = asyncio.Queue(
+        maxsize=settings.webhook_queue_size
+    )
+    app.state.webhook_queue = webhook_queue
+    workers = [
+        asyncio.create_task(_webhook_worker(webhook_queue))
+        for _ in range(settings.webhook_workers)
+    ]
+
     yield
 
     # Shutdown
+    await webhook_queue.join()
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
     await webhook_sender.close()
     logger.info("Merchant B Simulator shutdown complete")
+    _log_listener.stop()
 
 
 app = FastAPI(
@@ -142,35 +257,86 @@ Chaos mode merchant simulator for resilience testing.
 )
 
 
+# ============================================================================
+# Middleware
+# ============================================================================
+
+
+class RequestContextMiddleware:
+    """Bind per-request logging context once for every log call.
+
+    Each HTTP request gets a ``request_id`` and the ``merchant_id`` bound in
+    structlog's context variables, so handlers only pass event-specific
+    fields. The context is cleared when the request finishes.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI app.
+
+        Args:
+            app: Downstream ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI call."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        clear_contextvars()
+        bind_contextvars(request_id=uuid4().hex, merchant_id=settings.merchant_id)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            clear_contextvars()
+
+
+app.add_middleware(RequestContextMiddleware)
+
+
 # ============================================================================
 # Dependencies
 # ============================================================================
+# The stores are process-wide singletons, so each dependency resolves its
+# instance once. Tests that reset the singletons must also cache_clear() these.
 
 
+@lru_cache(maxsize=1)
 def get_products() -> ProductStore:
     """Get product store dependency."""
     return get_product_store()
 
 
+@lru_cache(maxsize=1)
 def get_checkouts() -> CheckoutStore:
     """Get checkout store dependency."""
     return get_checkout_store()
 
 
+@lru_cache(maxsize=1)
 def get_webhooks() -> WebhookSender:
     """Get webhook sender dependency."""
     return get_webhook_sender(
         webhook_url=settings.webhook_url,
         webhook_secret=settings.webhook_secret,
         merchant_id=settings.merchant_id,
+        max_attempts=settings.webhook_max_attempts,
+        supports_batch=settings.webhook_supports_batch,
     )
 
 
+@lru_cache(maxsize=1)
 def get_chaos() -> ChaosController:
     """Get chaos controller dependency."""
     return get_chaos_controller()
 
 
+def get_webhook_queue(request: Request) -> "asyncio.Queue[WebhookJob]":
+    """Get the webhook delivery queue dependency."""
+    return request.app.state.webhook_queue
+
+
 # ============================================================================
 # Response Models
 # ============================================================================
@@ -241,9 +407,9 @@ async def get_stats(
     """
     return StatsResponse(
         merchant_id=settings.merchant_id,
-        product_count=len(products._products),
-        checkout_count=len(checkouts._sessions),
-        chaos_event_count=len(chaos._event_log),
+        product_count=products.product_count,
+        checkout_count=checkouts.checkout_count,
+        chaos_event_count=chaos.event_count,
         ucp_version="1.0.0",
     )
 
@@ -253,8 +419,102 @@ async def get_stats(
 # ============================================================================
 
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header covers an ETag.
+
+    Args:
+        request: Incoming request.
+        etag: Current ETag of the resource.
+
+    Returns:
+        True if the client's cached copy is still current.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return etag in (tag.strip() for tag in header.split(","))
+
+
+def _not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the current ETag."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+    )
+
+
+# Serializes /products responses minus the items, which come pre-serialized
+_product_list_envelope = TypeAdapter(ProductListResponse)
+
+
+def _cached_product_page(
+    products: ProductStore,
+    page: int,
+    page_size: int,
+    category_id: int | None,
+    brand: str | None,
+    min_price: int | None,
+    max_price: int | None,
+    in_stock: bool | None,
+    search: str | None,
+    sort_by: str | None,
+    sort_order: str,
+    after: tuple[int | float, str] | None,
+    with_total: bool,
+) -> tuple[list[ProductSchema], int | None]:
+    """Memoize one ``list_products`` page (plus peek item) and its total.
+
+    Pages live in the store's own LRU ``page_cache``, keyed on the store
+    version and the parsed query values: the key does not depend on
+    query-string order, any chaos change to the store causes a miss, and a
+    replaced store takes its pages with it. Callers must not mutate the
+    returned list.
+    """
+    key = (
+        products.version,
+        page,
+        page_size,
+        category_id,
+        brand,
+        min_price,
+        max_price,
+        in_stock,
+        search,
+        sort_by,
+        sort_order,
+        after,
+        with_total,
+    )
+    cache = products.page_cache
+    result = cache.get(key)
+    if result is not None:
+        cache.move_to_end(key)
+        return result
+
+    result = cache[key] = products.list_products(
+        page=page,
+        page_size=page_size,
+        category_id=category_id,
+        brand=brand,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+        search=search,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        after=after,
+        with_total=with_total,
+        max_total=settings.products_max_total,
+        # Fetch one extra item to learn whether another page exists
+        peek=True,
+    )
+    if len(cache) > settings.products_page_cache_size:
+        cache.popitem(last=False)
+    return result
+
+
 @app.get("/products", response_model=ProductListResponse, tags=["Products"])
 async def list_products(
+    request: Request,
     products: Annotated[ProductStore, Depends(get_products)],
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 20,
@@ -266,11 +526,20 @@ async def list_products(
     search: Annotated[str | None, Query()] = None,
     sort_by: Annotated[str | None, Query(pattern="^(price|rating)$")] = None,
     sort_order: Annotated[str, Query(pattern="^(asc|desc)$")] = "asc",
-) -> ProductListResponse:
+    cursor: Annotated[str | None, Query()] = None,
+    with_total: Annotated[bool, Query()] = True,
+) -> Response:
     """List products with filtering and pagination.
 
+    Pages can be requested by ``cursor`` (keyset) or by the legacy ``page``
+    number; ``next_cursor`` is returned whenever more results exist.
+    Result pages are memoized until the store version changes, items are
+    written from the store's cached product JSON, and responses carry an
+    ETag derived from the store version and the normalized query string; a
+    matching ``If-None-Match`` yields 304.
+
     Args:
-        page: Page number (1-based).
+        page: Page number (1-based), ignored when cursor is given.
         page_size: Items per page.
         category_id: Filter by category ID.
         brand: Filter by brand name.
@@ -280,31 +549,86 @@ async def list_products(
         search: Search in title/description.
         sort_by: Sort field (price, rating).
         sort_order: Sort order (asc, desc).
+        cursor: Opaque cursor from a previous response's next_cursor.
+        with_total: Whether to count all matches; skipping the count lets
+            the store stop filtering once the page is full.
 
     Returns:
-        Paginated product list.
+        Paginated product list, or an empty 304 response.
     """
-    items, total = products.list_products(
-        page=page,
-        page_size=page_size,
-        category_id=category_id,
-        brand=brand,
-        min_price=min_price,
-        max_price=max_price,
-        in_stock=in_stock,
-        search=search,
-        sort_by=sort_by,
-        sort_order=sort_order,
+    # Parameter order does not change the result, so hash it sorted
+    query = "&".join(
+        f"{key}={value}" for key, value in sorted(request.query_params.multi_items())
     )
+    etag = 'W/"{}"'.format(
+        hashlib.blake2b(
+            f"{products.version}:{query}".encode(), digest_size=8
+        ).hexdigest()
+    )
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error_code": "INVALID_CURSOR",
+                    "message": str(e),
+                },
+            )
 
-    has_more = (page * page_size) < total
+    items, total = _cached_product_page(
+        products,
+        page,
+        page_size,
+        category_id,
+        brand,
+        min_price,
+        max_price,
+        in_stock,
+        search,
+        sort_by,
+        sort_order,
+        after,
+        with_total,
+    )
 
-    return ProductListResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_more=has_more,
+    has_more = len(items) > page_size
+    items = items[:page_size]
+
+    next_cursor = None
+    if has_more and items:
+        next_cursor = encode_cursor(
+            products.get_sort_key(items[-1].id, sort_by, sort_order)
+        )
+
+    # Serialize the envelope alone and splice in the cached product JSON
+    envelope = _product_list_envelope.dump_json(
+        ProductListResponse.model_construct(
+            items=[],
+            total=total,
+            page=page,
+            page_size=page_size,
+            has_more=has_more,
+            next_cursor=next_cursor,
+        )
+    )
+    head, tail = envelope.split(b'"items":[]', 1)
+    body = b"".join(
+        [
+            head,
+            b'"items":[',
+            b",".join([products.get_product_json(item.id) for item in items]),
+            b"]",
+            tail,
+        ]
+    )
+    return Response(
+        content=body, media_type="application/json", headers={"ETag": etag}
     )
 
 
@@ -316,20 +640,26 @@ async def list_products(
 )
 async def get_product(
     product_id: str,
+    request: Request,
     products: Annotated[ProductStore, Depends(get_products)],
-) -> ProductSchema:
+) -> Response:
     """Get product details by ID.
 
+    The body is the store's cached JSON for the product. Responses carry
+    an ETag that changes whenever chaos mutates the product; a matching
+    ``If-None-Match`` yields 304.
+
     Args:
         product_id: Product ID.
 
     Returns:
-        Product details.
+        Product details, or an empty 304 response.
 
     Raises:
         HTTPException: If product not found.
     """
-    product = products.get_product(product_id)
+    # Look the product up first so a stale tag never hides a 404
+    product = products.get_product_json(product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -338,7 +668,14 @@ async def get_product(
                 "message": f"Product not found: {product_id}",
             },
         )
-    return product
+
+    etag = f'W/"{product_id}-{products.get_product_version(product_id)}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    return Response(
+        content=product, media_type="application/json", headers={"ETag": etag}
+    )
 
 
 # ============================================================================
@@ -358,9 +695,11 @@ async def get_product(
 )
 async def create_quote(
     request: QuoteRequest,
-    background_tasks: BackgroundTasks,
     checkouts: Annotated[CheckoutStore, Depends(get_checkouts)],
     webhooks: Annotated[WebhookSender, Depends(get_webhooks)],
+    webhook_queue: Annotated[
+        "asyncio.Queue[WebhookJob]", Depends(get_webhook_queue)
+    ],
 ) -> CheckoutSchema:
     """Create a quote for items.
 
@@ -384,21 +723,25 @@ async def create_quote(
             customer_email=request.customer_email,
             idempotency_key=request.idempotency_key,
         )
+        bind_contextvars(checkout_id=session.id)
 
         # Send webhook in background
-        background_tasks.add_task(
-            webhooks.send_checkout_quoted,
-            checkout_id=session.id,
-            total=session.total,
-            currency=session.currency,
-            receipt_hash=session.receipt_hash or "",
+        await webhook_queue.put(
+            [
+                (
+                    webhooks.send_checkout_quoted,
+                    {
+                        "checkout_id": session.id,
+                        "total": session.total,
+                        "currency": session.currency,
+                        "receipt_hash": session.receipt_hash or "",
+                    },
+                )
+            ]
         )
 
         logger.info(
-            "Quote created",
-            checkout_id=session.id,
-            total=session.total,
-            items_count=len(session.items),
+            "Quote created", total=session.total, items_count=len(session.items)
         )
 
         return checkouts.to_schema(session)
@@ -447,6 +790,29 @@ async def get_checkout(
     return checkouts.to_schema(session)
 
 
+# Checkout item fields sent in the order_created webhook payload
+_ORDER_ITEM_FIELDS = (
+    "product_id",
+    "variant_id",
+    "sku",
+    "title",
+    "quantity",
+    "unit_price",
+)
+_order_item_values = operator.attrgetter(*_ORDER_ITEM_FIELDS)
+
+# Confirm failures classified by message substring, checked in order:
+# (substring, status code, error code, send checkout-failed webhook)
+_CONFIRM_ERROR_MATCHERS: tuple[tuple[str, int, str, bool], ...] = (
+    ("not found", status.HTTP_404_NOT_FOUND, "CHECKOUT_NOT_FOUND", False),
+    ("expired", status.HTTP_400_BAD_REQUEST, "CHECKOUT_EXPIRED", False),
+    ("price", status.HTTP_409_CONFLICT, "PRICE_CHANGED", True),
+    ("stock", status.HTTP_409_CONFLICT, "OUT_OF_STOCK", True),
+    ("state", status.HTTP_409_CONFLICT, "INVALID_STATE", False),
+)
+_CONFIRM_ERROR_DEFAULT = (status.HTTP_400_BAD_REQUEST, "CONFIRMATION_FAILED", False)
+
+
 @app.post(
     "/checkout/{checkout_id}/confirm",
     response_model=ConfirmResponse,
@@ -460,9 +826,11 @@ async def get_checkout(
 async def confirm_checkout(
     checkout_id: str,
     request: ConfirmRequest,
-    background_tasks: BackgroundTasks,
     checkouts: Annotated[CheckoutStore, Depends(get_checkouts)],
     webhooks: Annotated[WebhookSender, Depends(get_webhooks)],
+    webhook_queue: Annotated[
+        "asyncio.Queue[WebhookJob]", Depends(get_webhook_queue)
+    ],
 ) -> ConfirmResponse:
     """Confirm a checkout session.
 
@@ -483,6 +851,7 @@ async def confirm_checkout(
     Raises:
         HTTPException: If checkout not found, expired, or chaos triggered.
     """
+    bind_contextvars(checkout_id=checkout_id)
     try:
         session = checkouts.confirm_checkout(
             checkout_id=checkout_id,
@@ -490,37 +859,36 @@ async def confirm_checkout(
             idempotency_key=request.idempotency_key,
         )
 
-        # Send webhooks in background
-        background_tasks.add_task(
-            webhooks.send_checkout_confirmed,
-            checkout_id=session.id,
-            merchant_order_id=session.merchant_order_id or "",
-            total=session.total,
-            currency=session.currency,
-        )
-
-        background_tasks.add_task(
-            webhooks.send_order_created,
-            checkout_id=session.id,
-            merchant_order_id=session.merchant_order_id or "",
-            total=session.total,
-            currency=session.currency,
-            items=[
-                {
-                    "product_id": item.product_id,
-                    "variant_id": item.variant_id,
-                    "sku": item.sku,
-                    "title": item.title,
-                    "quantity": item.quantity,
-                    "unit_price": item.unit_price,
-                }
-                for item in session.items
-            ],
+        # Send webhooks in background; one job keeps confirmed before order
+        await webhook_queue.put(
+            [
+                (
+                    webhooks.send_checkout_confirmed,
+                    {
+                        "checkout_id": session.id,
+                        "merchant_order_id": session.merchant_order_id or "",
+                        "total": session.total,
+                        "currency": session.currency,
+                    },
+                ),
+                (
+                    webhooks.send_order_created,
+                    {
+                        "checkout_id": session.id,
+                        "merchant_order_id": session.merchant_order_id or "",
+                        "total": session.total,
+                        "currency": session.currency,
+                        "items": [
+                            dict(zip(_ORDER_ITEM_FIELDS, _order_item_values(item)))
+                            for item in session.items
+                        ],
+                    },
+                ),
+            ]
         )
 
         logger.info(
             "Checkout confirmed",
-            checkout_id=session.id,
             merchant_order_id=session.merchant_order_id,
             total=session.total,
         )
@@ -535,45 +903,30 @@ async def confirm_checkout(
 
     except ValueError as e:
         error_message = str(e)
-        logger.warning(
-            "Checkout confirmation failed",
-            checkout_id=checkout_id,
-            error=error_message,
-        )
+        logger.warning("Checkout confirmation failed", error=error_message)
 
         # Determine appropriate status code and error code
-        if "not found" in error_message.lower():
-            status_code = status.HTTP_404_NOT_FOUND
-            error_code = "CHECKOUT_NOT_FOUND"
-        elif "expired" in error_message.lower():
-            status_code = status.HTTP_400_BAD_REQUEST
-            error_code = "CHECKOUT_EXPIRED"
-        elif "price" in error_message.lower():
-            status_code = status.HTTP_409_CONFLICT
-            error_code = "PRICE_CHANGED"
-            # Send price changed webhook
-            background_tasks.add_task(
-                webhooks.send_checkout_failed,
-                checkout_id=checkout_id,
-                reason=error_message,
-                error_code="PRICE_CHANGED",
-            )
-        elif "stock" in error_message.lower():
-            status_code = status.HTTP_409_CONFLICT
-            error_code = "OUT_OF_STOCK"
+        lower = error_message.lower()
+        status_code, error_code, notify = _CONFIRM_ERROR_DEFAULT
+        for substring, *classification in _CONFIRM_ERROR_MATCHERS:
+            if substring in lower:
+                status_code, error_code, notify = classification
+                break
+
+        if notify:
             # Send failed webhook
-            background_tasks.add_task(
-                webhooks.send_checkout_failed,
-                checkout_id=checkout_id,
-                reason=error_message,
-                error_code="OUT_OF_STOCK",
+            await webhook_queue.put(
+                [
+                    (
+                        webhooks.send_checkout_failed,
+                        {
+                            "checkout_id": checkout_id,
+                            "reason": error_message,
+                            "error_code": error_code,
+                        },
+                    )
+                ]
             )
-        elif "state" in error_message.lower():
-            status_code = status.HTTP_409_CONFLICT
-            error_code = "INVALID_STATE"
-        else:
-            status_code = status.HTTP_400_BAD_REQUEST
-            error_code = "CONFIRMATION_FAILED"
 
         raise HTTPException(
             status_code=status_code,
@@ -589,6 +942,37 @@ async def confirm_checkout(
 # ============================================================================
 
 
+# Scenario path segments are looked up directly in the enum's value map;
+# the enum values stay in the OpenAPI schema for documentation
+_ScenarioPath = Annotated[
+    str, Path(json_schema_extra={"enum": [s.value for s in ChaosScenario]})
+]
+
+
+def _parse_scenario(value: str) -> ChaosScenario:
+    """Resolve a scenario path segment to its enum member.
+
+    Args:
+        value: Scenario value from the URL.
+
+    Returns:
+        Matching chaos scenario.
+
+    Raises:
+        HTTPException: If no scenario has this value.
+    """
+    scenario = ChaosScenario._value2member_map_.get(value)
+    if scenario is None:
+        raise HTTPException(
+            status_code=422,  # named constant differs across Starlette releases
+            detail={
+                "error_code": "INVALID_SCENARIO",
+                "message": f"Unknown chaos scenario: {value}",
+            },
+        )
+    return scenario
+
+
 @app.post(
     "/chaos/configure",
     response_model=ChaosConfigResponse,
@@ -665,7 +1049,7 @@ async def disable_all_chaos(
     tags=["Chaos Mode"],
 )
 async def enable_chaos_scenario(
-    scenario: ChaosScenario,
+    scenario: _ScenarioPath,
     chaos: Annotated[ChaosController, Depends(get_chaos)],
 ) -> ChaosConfigResponse:
     """Enable a specific chaos scenario.
@@ -675,8 +1059,11 @@ async def enable_chaos_scenario(
 
     Returns:
         Updated chaos configuration.
+
+    Raises:
+        HTTPException: If the scenario is unknown.
     """
-    return chaos.enable_scenario(scenario)
+    return chaos.enable_scenario(_parse_scenario(scenario))
 
 
 @app.post(
@@ -685,7 +1072,7 @@ async def enable_chaos_scenario(
     tags=["Chaos Mode"],
 )
 async def disable_chaos_scenario(
-    scenario: ChaosScenario,
+    scenario: _ScenarioPath,
     chaos: Annotated[ChaosController, Depends(get_chaos)],
 ) -> ChaosConfigResponse:
     """Disable a specific chaos scenario.
@@ -695,8 +1082,11 @@ async def disable_chaos_scenario(
 
     Returns:
         Updated chaos configuration.
+
+    Raises:
+        HTTPException: If the scenario is unknown.
     """
-    return chaos.disable_scenario(scenario)
+    return chaos.disable_scenario(_parse_scenario(scenario))
 
 
 @app.get(
@@ -927,24 +1317,28 @@ async def reset_product(
 # ============================================================================
 
 
+# Error bodies are serialized by pydantic's core, like the route responses
+_error_body = TypeAdapter(dict[str, Any])
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc: HTTPException):
     """Handle HTTP exceptions with consistent format."""
     detail = exc.detail
     if isinstance(detail, dict):
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
-                "error_code": detail.get("error_code", "ERROR"),
-                "message": detail.get("message", str(detail)),
-                "details": detail.get("details", []),
-            },
-        )
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
+        content = {
+            "error_code": detail.get("error_code", "ERROR"),
+            "message": detail.get("message", str(detail)),
+            "details": detail.get("details", []),
+        }
+    else:
+        content = {
             "error_code": "ERROR",
             "message": str(detail),
             "details": [],
-        },
+        }
+    return Response(
+        content=_error_body.dump_json(content),
+        status_code=exc.status_code,
+        media_type="application/json",
     )
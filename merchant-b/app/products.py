@@ -4,18 +4,26 @@ Generates and stores products with lower inventory and price volatility.
 Supports dynamic price changes for chaos testing.
 """
 
+import base64
+import binascii
 import hashlib
+import json
 import random
+import re
+import threading
 import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Iterator
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from pydantic import TypeAdapter
 
 from app.schemas import (
     Currency,
-    PriceSchema,
     ProductSchema,
-    ProductVariantSchema,
 )
 
 
@@ -23,6 +31,15 @@ from app.schemas import (
 # Constants
 # ============================================================================
 
+# Splits lowercased search text and queries into word tokens
+_WORD_SPLIT = re.compile(r"\W+")
+
+# Fields list_products can sort by
+_SORT_FIELDS = ("price", "rating")
+
+# Validates a batch of product dicts in one pydantic-core call
+_PRODUCT_LIST_ADAPTER = TypeAdapter(list[ProductSchema])
+
 BRANDS = [
     "Acme",
     "Contoso",
@@ -169,7 +186,7 @@ CATEGORIES = [
 # ============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class InMemoryProduct:
     """Internal product representation with chaos support."""
 
@@ -199,6 +216,11 @@ class ProductStore:
 
     Generates products with LOW inventory and price volatility
     for chaos testing scenarios.
+
+    Products are mutated in place by the chaos methods. Every method runs
+    to completion without awaiting and is only called from async endpoints
+    on the event loop, so a listing never observes a half-applied change;
+    callers must not use the store from worker threads.
     """
 
     def __init__(
@@ -218,9 +240,49 @@ class ProductStore:
         self.seed = seed
         self.products_per_category = products_per_category
         self._products: dict[str, InMemoryProduct] = {}
-        self._variants: dict[str, dict] = {}  # variant_id -> variant data
+        # variant_id -> variant data; the same dicts as product.variants,
+        # so chaos updates each variant in one place
+        self._variants: dict[str, dict] = {}
         self._price_change_percent: int = 15  # Default 15% price change
+        # Inverted indexes for list_products, as int bitsets over catalog
+        # positions so filters combine with a single & and set bits come
+        # back out in catalog order. Chaos only mutates price and stock, so
+        # all but the stock bitset depend on the catalog alone.
+        self._ids: list[str] = []  # catalog order -> ID; also random picks
+        self._position: dict[str, int] = {}  # ID -> catalog order
+        self._category_bits: dict[int, int] = {}
+        self._brand_bits: dict[str, int] = {}  # lowercased brand -> bits
+        self._word_bits: dict[str, int] = {}  # search text token -> bits
+        self._in_stock_bits: int = 0  # kept current by the chaos methods
+        self._search_text: dict[str, str] = {}  # ID -> lowercased title/desc
+        # Full catalog presorted per (sort_by, sort_order), built up front;
+        # chaos price changes move the product within the price orders
+        self._sorted: dict[tuple[str, str], list[InMemoryProduct]] = {}
+        # Bumped on every chaos mutation; the API derives ETags from these
+        self._version: int = 0
+        self._product_versions: dict[str, int] = {}  # ID -> version
+        # Response schemas, shared across requests and dropped when chaos
+        # changes the product; callers must not mutate them
+        self._schemas: dict[str, ProductSchema] = {}
+        self._product_json: dict[str, bytes] = {}  # ID -> serialized schema
+        # Result pages memoized by the API, keyed on (version, query), so
+        # they are dropped together with the store that produced them
+        self.page_cache: OrderedDict[tuple, Any] = OrderedDict()
+        # Hashed ahead of the per-product fields in every product ID
+        # (masked to 64 bits, so any int seed works; in-range seeds encode
+        # exactly as their signed two's-complement bytes)
+        self._id_prefix = merchant_id.encode() + (seed & (2**64 - 1)).to_bytes(
+            8, "little"
+        )
         self._generate_products()
+        self._build_indexes()
+        # Products that may differ from their reset state: every product
+        # until its first reset, then only those chaos has touched since
+        self._dirty: set[str] = set(self._products)
+        self._cache_schemas(list(self._products.values()))
+        for sort_by in _SORT_FIELDS:
+            for sort_order in ("asc", "desc"):
+                self._sorted_products(sort_by, sort_order)
 
     def _deterministic_seed(self, *args: str | int) -> int:
         """Create deterministic seed from arguments."""
@@ -230,21 +292,29 @@ class ProductStore:
 
     def _generate_product_id(self, category_id: int, index: int) -> str:
         """Generate deterministic product ID."""
-        data = f"{self.merchant_id}:{category_id}:{index}:{self.seed}"
-        return hashlib.md5(data.encode()).hexdigest()[:32]
+        h = hashlib.blake2b(self._id_prefix, digest_size=16)
+        h.update(category_id.to_bytes(4, "little"))
+        h.update(index.to_bytes(4, "little"))
+        return h.hexdigest()
 
     def _generate_variant_id(self, product_id: str, suffix: str) -> str:
         """Generate deterministic variant ID."""
-        data = f"{product_id}:{suffix}"
-        return hashlib.md5(data.encode()).hexdigest()[:32]
+        h = hashlib.blake2b(product_id.encode(), digest_size=16)
+        h.update(b":")
+        h.update(suffix.encode())
+        return h.hexdigest()
 
     def _generate_products(self) -> None:
         """Generate all products with low inventory."""
+        # One generator, reseeded per product rather than reallocated
+        product_rng = random.Random()
         for category in CATEGORIES:
-            rng = random.Random(self._deterministic_seed(self.seed, category["id"]))
+            # Per-category parts of the SKU and description
+            sku_prefix = f"{category['name'][:3].upper()}-{category['id']:04d}-"
+            category_lower = category["name"].lower()
 
             for i in range(self.products_per_category):
-                product_rng = random.Random(
+                product_rng.seed(
                     self._deterministic_seed(self.seed, category["id"], i)
                 )
 
@@ -255,13 +325,13 @@ class ProductStore:
                 title = template.format(brand=brand, adj=adj)
 
                 # Generate SKU
-                prefix = category["name"][:3].upper()
-                sku = f"{prefix}-{category['id']:04d}-{i:03d}"
+                sku = f"{sku_prefix}{i:03d}"
 
                 # Generate price
                 min_price, max_price = category["price_range"]
-                base_price = product_rng.randint(min_price, max_price)
-                base_price = (base_price // 100) * 100 + 99  # Round to .99
+                # Draw whole dollars and end every price in .99
+                dollars = product_rng.randint(min_price // 100, max_price // 100)
+                base_price = dollars * 100 + 99
 
                 # Generate rating
                 rating = round(product_rng.uniform(3.5, 5.0), 1)
@@ -285,7 +355,7 @@ class ProductStore:
                     id=product_id,
                     sku=sku,
                     title=title,
-                    description=f"High-quality {category['name'].lower()} from {brand}. "
+                    description=f"High-quality {category_lower} from {brand}. "
                     f"Part of our {adj.lower()} collection.",
                     brand=brand,
                     category_id=category["id"],
@@ -306,10 +376,78 @@ class ProductStore:
 
                 # Index variants
                 for variant in variants:
-                    self._variants[variant["id"]] = {
-                        **variant,
-                        "product_id": product_id,
-                    }
+                    variant["product_id"] = product_id
+                    self._variants[variant["id"]] = variant
+
+    def _build_indexes(self) -> None:
+        """Build category/brand/stock bitsets, search text and word index."""
+        categories = self._category_bits
+        brands = self._brand_bits
+        words = self._word_bits
+        for position, product in enumerate(self._products.values()):
+            bit = 1 << position
+            self._ids.append(product.id)
+            self._position[product.id] = position
+            category = product.category_id
+            categories[category] = categories.get(category, 0) | bit
+            brand = product.brand.lower()
+            brands[brand] = brands.get(brand, 0) | bit
+            if product.in_stock:
+                self._in_stock_bits |= bit
+            # NUL-joined, as in merchant-a, so a query spanning a line break
+            # cannot match across the end of the title into the description
+            text = f"{product.title}\0{product.description}".lower()
+            self._search_text[product.id] = text
+            for word in _WORD_SPLIT.split(text):
+                if word:
+                    words[word] = words.get(word, 0) | bit
+
+    def _set_in_stock(self, product: InMemoryProduct, in_stock: bool) -> None:
+        """Update a product's stock flag and the in-stock bitset together."""
+        product.in_stock = in_stock
+        bit = 1 << self._position[product.id]
+        if in_stock:
+            self._in_stock_bits |= bit
+        else:
+            self._in_stock_bits &= ~bit
+
+    def _ids_from_bits(self, bits: int) -> list[str]:
+        """Translate a bitset back to product IDs in catalog order."""
+        ids = self._ids
+        result = []
+        while bits:
+            low = bits & -bits
+            result.append(ids[low.bit_length() - 1])
+            bits ^= low
+        return result
+
+    def _search_candidates(self, search_lower: str) -> int | None:
+        """Narrow a substring search to products that can possibly match.
+
+        Each word in the query must lie inside a single word of any text
+        containing the query, so the word index is scanned per query token
+        instead of scanning every product's text. Candidates still need the
+        substring check.
+
+        Args:
+            search_lower: Lowercased search query.
+
+        Returns:
+            Bitset of candidate products, or None if the query has no word
+            characters to narrow by.
+        """
+        candidates: int | None = None
+        for token in _WORD_SPLIT.split(search_lower):
+            if not token:
+                continue
+            bits = 0
+            for word, word_bits in self._word_bits.items():
+                if token in word:
+                    bits |= word_bits
+            candidates = bits if candidates is None else candidates & bits
+            if not candidates:
+                break
+        return candidates
 
     def _generate_variants(
         self, product_id: str, variant_type: str, rng: random.Random
@@ -357,6 +495,27 @@ class ProductStore:
 
         return variants
 
+    @property
+    def product_count(self) -> int:
+        """Number of products in the store."""
+        return len(self._products)
+
+    @property
+    def version(self) -> int:
+        """Store-wide version, bumped whenever any product changes."""
+        return self._version
+
+    def get_product_version(self, product_id: str) -> int:
+        """Get the version of a single product.
+
+        Args:
+            product_id: Product ID.
+
+        Returns:
+            Number of times the product has been changed (0 if never).
+        """
+        return self._product_versions.get(product_id, 0)
+
     def get_product(self, product_id: str) -> ProductSchema | None:
         """Get product by ID.
 
@@ -371,6 +530,27 @@ class ProductStore:
             return None
         return self._to_schema(product)
 
+    def get_product_json(self, product_id: str) -> bytes | None:
+        """Get a product's schema serialized as JSON.
+
+        The bytes are cached alongside the schema and dropped with it when
+        chaos changes the product, so responses can reuse them as-is.
+
+        Args:
+            product_id: Product ID.
+
+        Returns:
+            UTF-8 JSON of the product schema, or None if not found.
+        """
+        data = self._product_json.get(product_id)
+        if data is None:
+            product = self._products.get(product_id)
+            if not product:
+                return None
+            data = self._to_schema(product).model_dump_json().encode()
+            self._product_json[product_id] = data
+        return data
+
     def get_variant(self, variant_id: str) -> dict | None:
         """Get variant by ID.
 
@@ -394,9 +574,17 @@ class ProductStore:
         search: str | None = None,
         sort_by: str | None = None,
         sort_order: str = "asc",
-    ) -> tuple[list[ProductSchema], int]:
+        after: tuple[int | float, str] | None = None,
+        with_total: bool = True,
+        max_total: int | None = None,
+        peek: bool = False,
+    ) -> tuple[list[ProductSchema], int | None]:
         """List products with filtering and pagination.
 
+        Pages are selected either by ``page`` (offset) or, when ``after`` is
+        given, by keyset: the products that follow the given sort key (see
+        ``get_sort_key``) in list order. Ties are broken by product ID.
+
         Args:
             page: Page number (1-based).
             page_size: Items per page.
@@ -408,71 +596,215 @@ class ProductStore:
             search: Search in title/description.
             sort_by: Field to sort by (price, rating).
             sort_order: Sort order (asc, desc).
+            after: Sort key of the last product already returned; ``page`` is
+                ignored when set.
+            with_total: Whether to count all matches. When False, filtering
+                stops once the page is filled and the total is None.
+            max_total: Stop counting matches at this many.
+            peek: Return one extra product past the page, so callers can tell
+                whether another page exists.
 
         Returns:
             Tuple of (products, total_count).
         """
-        # Filter products
-        filtered = list(self._products.values())
-
+        # Intersect the category/brand/stock bitsets, then narrow a text
+        # search with the word index before the substring check
+        search_lower = search.lower() if search else None
+        masks: list[int] = []
         if category_id is not None:
-            filtered = [p for p in filtered if p.category_id == category_id]
-
+            masks.append(self._category_bits.get(category_id, 0))
         if brand is not None:
-            filtered = [p for p in filtered if p.brand.lower() == brand.lower()]
-
-        if min_price is not None:
-            filtered = [p for p in filtered if p.current_price >= min_price]
-
-        if max_price is not None:
-            filtered = [p for p in filtered if p.current_price <= max_price]
-
+            masks.append(self._brand_bits.get(brand.lower(), 0))
         if in_stock is not None:
-            filtered = [p for p in filtered if p.in_stock == in_stock]
-
-        if search:
-            search_lower = search.lower()
-            filtered = [
-                p
-                for p in filtered
-                if search_lower in p.title.lower()
-                or search_lower in p.description.lower()
-            ]
-
-        # Sort
-        if sort_by == "price":
-            filtered.sort(
-                key=lambda p: p.current_price, reverse=(sort_order == "desc")
+            if in_stock:
+                masks.append(self._in_stock_bits)
+            else:
+                masks.append(~self._in_stock_bits & ((1 << len(self._ids)) - 1))
+        if search_lower:
+            search_bits = self._search_candidates(search_lower)
+            if search_bits is not None:
+                masks.append(search_bits)
+
+        bits: int | None = None
+        if masks:
+            bits = masks[0]
+            for mask in masks[1:]:
+                bits &= mask
+
+        # Walk the presorted catalog so filtering preserves list order
+        if sort_by:
+            ordered = self._sorted_products(sort_by, sort_order)
+            if sort_by == "price" and (min_price is not None or max_price is not None):
+                # Price order makes the price range a contiguous window
+                ordered = self._price_window(ordered, sort_order, min_price, max_price)
+                min_price = max_price = None
+            if bits is None:
+                base = ordered
+            else:
+                position = self._position
+                base = [p for p in ordered if bits >> position[p.id] & 1]
+        elif bits is None:
+            base = list(self._products.values())
+        else:
+            base = [self._products[pid] for pid in self._ids_from_bits(bits)]
+
+        search_text = self._search_text
+
+        def matching(
+            products: Iterable[InMemoryProduct],
+        ) -> Iterator[InMemoryProduct]:
+            """Lazily apply the remaining filters, preserving order."""
+            if min_price is not None:
+                products = (p for p in products if p.current_price >= min_price)
+            if max_price is not None:
+                products = (p for p in products if p.current_price <= max_price)
+            if search_lower:
+                products = (p for p in products if search_lower in search_text[p.id])
+            return iter(products)
+
+        # Paginate, stopping the filter pass as soon as the page is full
+        limit = page_size + 1 if peek else page_size
+        total: int | None = None
+        if after is not None:
+            start = bisect_right(
+                base, after, key=lambda p: self._sort_key(p, sort_by, sort_order)
             )
+            paginated = list(islice(matching(islice(base, start, None)), limit))
+            if with_total:
+                total = sum(1 for _ in islice(matching(base), max_total))
+        else:
+            offset = (page - 1) * page_size
+            matches = matching(base)
+            seen = list(islice(matches, offset + limit))
+            paginated = seen[offset:]
+            if with_total:
+                remaining = None
+                if max_total is not None:
+                    remaining = max(0, max_total - len(seen))
+                total = len(seen) + sum(1 for _ in islice(matches, remaining))
+
+        if total is not None and max_total is not None:
+            total = min(total, max_total)
+
+        schemas = self._schemas
+        missing = [p for p in paginated if p.id not in schemas]
+        if missing:
+            self._cache_schemas(missing)
+        return [schemas[p.id] for p in paginated], total
+
+    def _sort_key(
+        self, product: InMemoryProduct, sort_by: str | None, sort_order: str
+    ) -> tuple[int | float, str]:
+        """Get the ascending key that orders a product in list results."""
+        if sort_by == "price":
+            value: int | float = product.current_price
         elif sort_by == "rating":
-            filtered.sort(key=lambda p: p.rating, reverse=(sort_order == "desc"))
+            value = product.rating
+        else:
+            return (self._position[product.id], product.id)
+        if sort_order == "desc":
+            value = -value
+        return (value, product.id)
+
+    def _sorted_products(
+        self, sort_by: str, sort_order: str
+    ) -> list[InMemoryProduct]:
+        """Get the whole catalog in list order for a sort, cached."""
+        ordered = self._sorted.get((sort_by, sort_order))
+        if ordered is None:
+            ordered = sorted(
+                self._products.values(),
+                key=lambda p: self._sort_key(p, sort_by, sort_order),
+            )
+            self._sorted[(sort_by, sort_order)] = ordered
+        return ordered
 
-        # Paginate
-        total = len(filtered)
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated = filtered[start:end]
+    def _price_window(
+        self,
+        ordered: list[InMemoryProduct],
+        sort_order: str,
+        min_price: int | None,
+        max_price: int | None,
+    ) -> list[InMemoryProduct]:
+        """Slice a price-ordered catalog to a price range with bisection.
+
+        Args:
+            ordered: Catalog in price list order for ``sort_order``.
+            sort_order: Sort order (asc, desc).
+            min_price: Minimum price in cents, inclusive.
+            max_price: Maximum price in cents, inclusive.
+
+        Returns:
+            The products within the range, still in list order.
+        """
 
-        return [self._to_schema(p) for p in paginated], total
+        def key(p: InMemoryProduct) -> tuple[int | float, str]:
+            return self._sort_key(p, "price", sort_order)
+
+        # Keys are (price, id), or (-price, id) for desc; a 1-tuple sorts
+        # before every full key with the same first element
+        if sort_order == "desc":
+            low = None if max_price is None else (-max_price,)
+            high = None if min_price is None else (-min_price + 1,)
+        else:
+            low = None if min_price is None else (min_price,)
+            high = None if max_price is None else (max_price + 1,)
+        start = 0 if low is None else bisect_left(ordered, low, key=key)
+        end = len(ordered) if high is None else bisect_left(ordered, high, key=key)
+        return ordered[start:end]
+
+    def get_sort_key(
+        self, product_id: str, sort_by: str | None, sort_order: str = "asc"
+    ) -> tuple[int | float, str] | None:
+        """Get a product's keyset pagination key for ``list_products``.
+
+        Args:
+            product_id: Product ID.
+            sort_by: Field to sort by (price, rating).
+            sort_order: Sort order (asc, desc).
+
+        Returns:
+            Sort key to pass as ``after``, or None if not found.
+        """
+        product = self._products.get(product_id)
+        if not product:
+            return None
+        return self._sort_key(product, sort_by, sort_order)
+
+    def _to_dict(self, product: InMemoryProduct) -> dict[str, Any]:
+        """Convert internal product to raw ``ProductSchema`` input."""
+        return {
+            "id": product.id,
+            "sku": product.sku,
+            "title": product.title,
+            "description": product.description,
+            "brand": product.brand,
+            "category_id": product.category_id,
+            "category_path": product.category_path,
+            "price": {"amount": product.current_price, "currency": Currency.USD},
+            "rating": product.rating,
+            "review_count": product.review_count,
+            "image_url": product.image_url,
+            "in_stock": product.in_stock,
+            "stock_quantity": product.stock_quantity,
+            "variants": product.variants,
+        }
 
     def _to_schema(self, product: InMemoryProduct) -> ProductSchema:
-        """Convert internal product to schema."""
-        return ProductSchema(
-            id=product.id,
-            sku=product.sku,
-            title=product.title,
-            description=product.description,
-            brand=product.brand,
-            category_id=product.category_id,
-            category_path=product.category_path,
-            price=PriceSchema(amount=product.current_price, currency=Currency.USD),
-            rating=product.rating,
-            review_count=product.review_count,
-            image_url=product.image_url,
-            in_stock=product.in_stock,
-            stock_quantity=product.stock_quantity,
-            variants=[ProductVariantSchema(**v) for v in product.variants],
+        """Convert internal product to schema, cached until it changes."""
+        schema = self._schemas.get(product.id)
+        if schema is None:
+            schema = ProductSchema.model_validate(self._to_dict(product))
+            self._schemas[product.id] = schema
+        return schema
+
+    def _cache_schemas(self, products: list[InMemoryProduct]) -> None:
+        """Build and cache schemas for several products in one validation."""
+        schemas = _PRODUCT_LIST_ADAPTER.validate_python(
+            [self._to_dict(p) for p in products]
         )
+        for product, schema in zip(products, schemas):
+            self._schemas[product.id] = schema
 
     def get_effective_price(
         self, product_id: str, variant_id: str | None = None
@@ -525,10 +857,83 @@ class ProductStore:
 
         return product.stock_quantity >= quantity
 
+    def get_product_bundle(
+        self, product_id: str, variant_id: str | None, quantity: int
+    ) -> tuple[InMemoryProduct, dict | None, int, bool] | None:
+        """Resolve everything a quote line needs in a single lookup.
+
+        Equivalent to calling ``get_product``, ``get_variant``,
+        ``get_effective_price`` and ``check_stock`` back to back, but reads
+        each dict entry once and skips building a ``ProductSchema``.
+
+        Args:
+            product_id: Product ID.
+            variant_id: Optional variant ID.
+            quantity: Requested quantity.
+
+        Returns:
+            Tuple of (product, variant or None, effective price, stock ok),
+            or None if the product is not found.
+        """
+        product = self._products.get(product_id)
+        if not product:
+            return None
+
+        price = product.current_price
+        if variant_id:
+            variant = self._variants.get(variant_id)
+            if variant is None:
+                return product, None, price, False
+            if variant["product_id"] == product_id:
+                price += variant["price_modifier"]
+            stock_ok = (
+                product.in_stock
+                and variant["in_stock"]
+                and variant["stock_quantity"] >= quantity
+            )
+            return product, variant, price, stock_ok
+
+        stock_ok = product.in_stock and product.stock_quantity >= quantity
+        return product, None, price, stock_ok
+
     # ========================================================================
     # Chaos Mode Methods
     # ========================================================================
 
+    def _bump_version(self, product_id: str) -> None:
+        """Record a change to a product and drop its cached schema."""
+        self._dirty.add(product_id)
+        self._schemas.pop(product_id, None)
+        self._product_json.pop(product_id, None)
+        self._version += 1
+        self._product_versions[product_id] = (
+            self._product_versions.get(product_id, 0) + 1
+        )
+
+    def _set_price(self, product: InMemoryProduct, price: int) -> None:
+        """Change a product's current price, keeping price orders sorted.
+
+        The product is moved within each cached price ordering rather than
+        dropping the orderings and re-sorting the catalog on the next list.
+        """
+        if price == product.current_price:
+            return
+        views = []
+        for sort_order in ("asc", "desc"):
+            ordered = self._sorted.get(("price", sort_order))
+            if ordered is None:
+                continue
+
+            def key(p: InMemoryProduct, sort_order: str = sort_order):
+                return self._sort_key(p, "price", sort_order)
+
+            del ordered[bisect_left(ordered, key(product), key=key)]
+            views.append((ordered, key))
+
+        product.current_price = price
+        for ordered, key in views:
+            insort(ordered, product, key=key)
+
     def set_price_change_percent(self, percent: int) -> None:
         """Set the price change percentage for chaos mode.
 
@@ -561,8 +966,9 @@ class ProductStore:
         else:
             new_price = max(99, old_price - change_amount)  # Minimum 99 cents
 
-        product.current_price = new_price
+        self._set_price(product, new_price)
         product.price_changed = True
+        self._bump_version(product_id)
 
         return (old_price, new_price)
 
@@ -587,16 +993,13 @@ class ProductStore:
             if variant and variant["product_id"] == product_id:
                 variant["in_stock"] = False
                 variant["stock_quantity"] = 0
-                # Update product variants list
-                for v in product.variants:
-                    if v["id"] == variant_id:
-                        v["in_stock"] = False
-                        v["stock_quantity"] = 0
+                self._bump_version(product_id)
                 return True
             return False
 
-        product.in_stock = False
+        self._set_in_stock(product, False)
         product.stock_quantity = 0
+        self._bump_version(product_id)
         return True
 
     def reset_product(self, product_id: str) -> bool:
@@ -612,27 +1015,27 @@ class ProductStore:
         if not product:
             return False
 
-        product.current_price = product.original_price
+        self._set_price(product, product.original_price)
         product.price_changed = False
-        product.in_stock = True
+        self._set_in_stock(product, True)
         product.stock_quantity = 10  # Reset to reasonable stock
 
-        # Reset variants
+        # Reset variants (shared with the variant index)
         for variant in product.variants:
             variant["in_stock"] = True
             variant["stock_quantity"] = 5
 
-        # Update variant index
-        for variant in product.variants:
-            if variant["id"] in self._variants:
-                self._variants[variant["id"]]["in_stock"] = True
-                self._variants[variant["id"]]["stock_quantity"] = 5
-
+        self._bump_version(product_id)
+        self._dirty.discard(product_id)
         return True
 
     def reset_all_products(self) -> None:
-        """Reset all products to original state."""
-        for product_id in self._products:
+        """Reset all products to original state.
+
+        Only products changed since their last reset are visited, so
+        repeated resets cost time proportional to the chaos applied.
+        """
+        for product_id in list(self._dirty):
             self.reset_product(product_id)
 
     def get_random_product_id(self) -> str | None:
@@ -641,13 +1044,52 @@ class ProductStore:
         Returns:
             Random product ID or None if no products.
         """
-        if not self._products:
+        if not self._ids:
             return None
-        return random.choice(list(self._products.keys()))
+        return random.choice(self._ids)
+
 
+def encode_cursor(sort_key: tuple[int | float, str]) -> str:
+    """Encode a ``list_products`` sort key as an opaque page cursor.
 
-# Global product store instance
+    Args:
+        sort_key: Key from ``ProductStore.get_sort_key``.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    return base64.urlsafe_b64encode(json.dumps(list(sort_key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[int | float, str]:
+    """Decode a page cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor string.
+
+    Returns:
+        Sort key to pass as ``after`` to ``list_products``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        value, product_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}") from None
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, (int, float))
+        or not isinstance(product_id, str)
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return (value, product_id)
+
+
+# Global product store instance; the lock keeps concurrent first calls
+# (sync dependencies run in the threadpool) from building it twice
 _product_store: ProductStore | None = None
+_product_store_lock = threading.Lock()
 
 
 def get_product_store(
@@ -657,6 +1099,9 @@ def get_product_store(
 ) -> ProductStore:
     """Get or create product store instance.
 
+    The first call creates the store with its arguments; later calls return
+    that store regardless of arguments.
+
     Args:
         merchant_id: Merchant identifier.
         seed: Random seed.
@@ -667,7 +1112,11 @@ def get_product_store(
     """
     global _product_store
     if _product_store is None:
-        _product_store = ProductStore(merchant_id, seed, products_per_category)
+        with _product_store_lock:
+            if _product_store is None:
+                _product_store = ProductStore(
+                    merchant_id, seed, products_per_category
+                )
     return _product_store
 
 
@@ -85,10 +85,17 @@ class ProductListResponse(BaseModel, UCPMixin):
     """Paginated product list response."""
 
     items: list[ProductSchema] = Field(..., description="List of products")
-    total: int = Field(..., description="Total number of products")
+    total: int | None = Field(
+        ...,
+        description="Total number of matching products (capped), "
+        "or null when not requested",
+    )
     page: int = Field(default=1, ge=1, description="Current page")
     page_size: int = Field(default=20, ge=1, le=100, description="Items per page")
     has_more: bool = Field(..., description="Whether more pages exist")
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page, if any"
+    )
 
 
 class ProductFilterParams(BaseModel):
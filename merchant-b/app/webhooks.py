@@ -4,26 +4,145 @@ Sends webhook notifications to CartPilot with chaos mode behaviors:
 - Duplicate webhooks (same event sent multiple times)
 - Delayed webhooks (webhooks sent after a delay)
 - Out-of-order webhooks (webhooks sent in wrong sequence)
+
+Every delivery carries ``Idempotency-Key: <event_id>``, identical across
+retries and duplicates, so receivers can dedupe before parsing the body.
+``X-Webhook-Attempt`` numbers retries of one delivery from 1, and
+``X-Is-Retry: true`` marks both retries and chaos duplicates.
 """
 
 import asyncio
+import collections
 import hashlib
 import hmac
 import random
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Coroutine
 
 import httpx
 import structlog
+from pydantic import TypeAdapter
 
-from app.schemas import ChaosScenario, WebhookEventType, WebhookPayloadSchema
+from app.schemas import ChaosScenario, WebhookEventType
 
 if TYPE_CHECKING:
     from app.chaos import ChaosController
 
 logger = structlog.get_logger()
 
+# Fail fast on an unreachable receiver, and keep enough warm connections for
+# duplicate/flush bursts to go out without reconnecting.
+_CLIENT_TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+_CLIENT_LIMITS = httpx.Limits(
+    max_keepalive_connections=100, max_connections=200, keepalive_expiry=60.0
+)
+
+# Responses worth retrying: rate limiting and server-side failures. Anything
+# else (auth, validation) will not succeed on a second attempt.
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Bodies above this size are signed off the event loop
+_OFFLOAD_SIGNING_BYTES = 4096
+
+
+@dataclass(slots=True, frozen=True)
+class OutboundPayload:
+    """Outbound webhook body.
+
+    Mirrors ``WebhookPayloadSchema`` on the wire; the sender produces every
+    field itself, so a plain dataclass replaces the validated model.
+    """
+
+    event_id: str
+    event_type: str  # WebhookEventType value, converted once in _build_payload
+    merchant_id: str
+    timestamp: datetime
+    data: dict[str, Any]
+    ucp_version: str = "1.0.0"
+
+
+_outbound_payload = TypeAdapter(OutboundPayload)
+_outbound_batch = TypeAdapter(list[OutboundPayload])
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for the webhook receiver.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are refused without touching the network. Once
+    ``recovery_window`` seconds have passed a single probe is let through:
+    success closes the circuit, failure re-opens it. A probe whose outcome is
+    never recorded gives up its slot after another ``recovery_window``.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 5, recovery_window: float = 30.0
+    ) -> None:
+        """Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            recovery_window: Seconds to stay open before probing.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_window = recovery_window
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent now.
+
+        Returns:
+            False while open (or while a half-open probe is in flight).
+        """
+        if self.state is CircuitState.CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state is CircuitState.OPEN:
+            if now - self._opened_at < self.recovery_window:
+                return False
+        elif now - self._probe_started_at < self.recovery_window:
+            return False
+        # Open long enough, or the last probe never reported back
+        self.state = CircuitState.HALF_OPEN
+        self._probe_started_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Record a request the receiver handled; closes the circuit."""
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed request; may open the circuit."""
+        self._failures += 1
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self._failures >= self.failure_threshold
+        ):
+            if self.state is not CircuitState.OPEN:
+                logger.warning(
+                    "Webhook circuit opened",
+                    consecutive_failures=self._failures,
+                    recovery_window=self.recovery_window,
+                )
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
 
 class WebhookSender:
     """Sends webhook events to CartPilot API with chaos mode support.
@@ -38,6 +157,14 @@ class WebhookSender:
         webhook_secret: str,
         merchant_id: str = "merchant-b",
         chaos_controller: "ChaosController | None" = None,
+        max_pending_webhooks: int = 1024,
+        max_attempts: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 30.0,
+        circuit_breaker: CircuitBreaker | None = None,
+        max_concurrent: int = 32,
+        client: httpx.AsyncClient | None = None,
+        supports_batch: bool = False,
     ) -> None:
         """Initialize webhook sender.
 
@@ -46,13 +173,50 @@ class WebhookSender:
             webhook_secret: Secret for HMAC signing.
             merchant_id: Merchant identifier.
             chaos_controller: Chaos controller for triggering scenarios.
+            max_pending_webhooks: Out-of-order queue bound; the oldest queued
+                webhook is dropped when it is exceeded.
+            max_attempts: Delivery attempts per webhook, including the first.
+            retry_base_delay: Backoff ceiling in seconds before the first retry;
+                doubles on each further retry.
+            retry_max_delay: Upper bound on the backoff ceiling in seconds.
+            circuit_breaker: Breaker guarding ``webhook_url``; a default one is
+                created when omitted.
+            max_concurrent: Cap on webhook POSTs in flight at once.
+            client: HTTP client to deliver with (e.g. one on an
+                ``httpx.MockTransport`` in tests); a pooled client is created
+                when omitted.
+            supports_batch: Whether the receiver accepts ``send_batch``
+                bodies at ``<webhook_url>/batch``.
         """
         self.webhook_url = webhook_url
+        self.supports_batch = supports_batch
         self.webhook_secret = webhook_secret
+        # Keyed once; _sign_payload copies it to skip per-call key derivation
+        self._hmac_template = hmac.new(webhook_secret.encode(), None, hashlib.sha256)
         self.merchant_id = merchant_id
+        self._log = logger.bind(component="webhook_sender", merchant_id=merchant_id)
         self.chaos_controller = chaos_controller
-        self._client = httpx.AsyncClient(timeout=10.0)
-        self._pending_webhooks: list[dict] = []  # For out-of-order chaos
+        self._client = client or httpx.AsyncClient(
+            timeout=_CLIENT_TIMEOUT, limits=_CLIENT_LIMITS
+        )
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "X-Merchant-Id": merchant_id,
+        }
+        self._retry_headers = {**self._base_headers, "X-Is-Retry": "true"}
+        self._max_attempts = max_attempts
+        self._retry_base_delay = retry_base_delay
+        self._retry_max_delay = retry_max_delay
+        self._breaker = circuit_breaker or CircuitBreaker()
+        # Bulkhead: duplicate and flush bursts queue here rather than
+        # stampeding the receiver
+        self._concurrency = asyncio.Semaphore(max_concurrent)
+        # Delayed and duplicate deliveries still in flight
+        self._background_tasks: set[asyncio.Task] = set()
+        # For out-of-order chaos
+        self._pending_webhooks: collections.deque[dict] = collections.deque(
+            maxlen=max_pending_webhooks
+        )
 
     def set_chaos_controller(self, controller: "ChaosController") -> None:
         """Set the chaos controller.
@@ -62,112 +226,251 @@ class WebhookSender:
         """
         self.chaos_controller = controller
 
+    def reset(self) -> None:
+        """Drop queued out-of-order webhooks and close the circuit (for testing)."""
+        self._pending_webhooks.clear()
+        self._breaker.record_success()
+
     def _generate_event_id(self) -> str:
-        """Generate unique event ID."""
-        return str(uuid.uuid4())
+        """Generate unique event ID (32-char hex UUID4, no dashes)."""
+        return uuid.uuid4().hex
 
-    def _sign_payload(self, payload: str) -> str:
+    def _sign_payload(self, payload: bytes) -> str:
         """Generate HMAC signature for payload.
 
         Args:
-            payload: JSON payload string.
+            payload: JSON payload bytes.
 
         Returns:
             HMAC-SHA256 signature.
         """
-        signature = hmac.new(
-            self.webhook_secret.encode(),
-            payload.encode(),
-            hashlib.sha256,
-        ).hexdigest()
-        return f"sha256={signature}"
+        mac = self._hmac_template.copy()
+        mac.update(payload)
+        return f"sha256={mac.hexdigest()}"
 
     def _build_payload(
-        self, event_type: WebhookEventType, data: dict[str, Any], event_id: str | None = None
-    ) -> WebhookPayloadSchema:
+        self,
+        event_type: WebhookEventType,
+        data: dict[str, Any],
+        event_id: str | None = None,
+        timestamp: datetime | None = None,
+    ) -> OutboundPayload:
         """Build webhook payload.
 
         Args:
             event_type: Type of event.
             data: Event-specific data.
             event_id: Optional event ID (for duplicates).
+            timestamp: Event time; defaults to now.
 
         Returns:
-            Webhook payload schema.
+            Outbound webhook payload.
         """
-        return WebhookPayloadSchema(
+        return OutboundPayload(
             event_id=event_id or self._generate_event_id(),
-            event_type=event_type,
+            event_type=event_type.value,
             merchant_id=self.merchant_id,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=timestamp or datetime.now(timezone.utc),
             data=data,
         )
 
+    async def _encode_payload(
+        self, payload: OutboundPayload
+    ) -> tuple[bytes, str]:
+        """Serialize and sign a payload once for every delivery attempt.
+
+        Large bodies (e.g. order events with many items) are signed in a
+        worker thread so the event loop keeps dispatching other webhooks;
+        OpenSSL releases the GIL while hashing them.
+
+        Args:
+            payload: Webhook payload.
+
+        Returns:
+            Tuple of (JSON body, signature header value).
+        """
+        payload_json = _outbound_payload.dump_json(payload)
+        return payload_json, await self._sign_body(payload_json)
+
+    async def _sign_body(self, body: bytes) -> str:
+        """Sign a request body, off the event loop when it is large.
+
+        Args:
+            body: Serialized request body.
+
+        Returns:
+            HMAC-SHA256 signature.
+        """
+        if len(body) > _OFFLOAD_SIGNING_BYTES:
+            return await asyncio.to_thread(self._sign_payload, body)
+        return self._sign_payload(body)
+
+    def _record_outcome(self, receiver_ok: bool) -> None:
+        """Report one request's outcome to the circuit breaker.
+
+        Args:
+            receiver_ok: Whether the receiver answered with a non-retryable
+                status.
+        """
+        if receiver_ok:
+            self._breaker.record_success()
+        else:
+            self._breaker.record_failure()
+
     async def _deliver_webhook(
-        self, payload: WebhookPayloadSchema, is_duplicate: bool = False
+        self,
+        payload: OutboundPayload,
+        payload_json: bytes,
+        signature: str,
+        is_duplicate: bool = False,
     ) -> bool:
         """Deliver a single webhook.
 
+        Transport errors and retryable statuses are retried with exponential
+        backoff and full jitter, up to ``max_attempts`` attempts in total.
+        Attempts are skipped outright while the circuit breaker is open.
+
         Args:
             payload: Webhook payload.
+            payload_json: Serialized payload body.
+            signature: HMAC signature of ``payload_json``.
             is_duplicate: Whether this is a duplicate delivery.
 
         Returns:
             True if delivery succeeded.
         """
-        payload_json = payload.model_dump_json()
-        signature = self._sign_payload(payload_json)
-
-        headers = {
-            "Content-Type": "application/json",
-            "X-Merchant-Signature": signature,
-            "X-Merchant-Id": self.merchant_id,
-            "X-Event-Id": payload.event_id,
-        }
+        for attempt in range(self._max_attempts):
+            if attempt:
+                delay = self._retry_delay(attempt)
+                self._log.info(
+                    "Retrying webhook delivery",
+                    event_type=payload.event_type,
+                    event_id=payload.event_id,
+                    attempt=attempt + 1,
+                    delay=delay,
+                )
+                await asyncio.sleep(delay)
 
-        if is_duplicate:
-            headers["X-Is-Retry"] = "true"
+            if not self._breaker.allow_request():
+                self._log.warning(
+                    "Webhook circuit open, skipping delivery",
+                    event_type=payload.event_type,
+                    event_id=payload.event_id,
+                    attempt=attempt + 1,
+                )
+                return False
 
-        try:
-            response = await self._client.post(
-                self.webhook_url,
-                content=payload_json,
-                headers=headers,
-            )
+            headers = {
+                **(
+                    self._retry_headers
+                    if is_duplicate or attempt
+                    else self._base_headers
+                ),
+                "X-Merchant-Signature": signature,
+                "X-Event-Id": payload.event_id,
+                "Idempotency-Key": payload.event_id,
+                "X-Webhook-Attempt": str(attempt + 1),
+            }
+
+            # Anything short of a non-retryable response, including
+            # cancellation, counts against the receiver
+            receiver_ok = False
+            try:
+                async with self._concurrency:
+                    response = await self._client.post(
+                        self.webhook_url,
+                        content=payload_json,
+                        headers=headers,
+                    )
+                receiver_ok = response.status_code not in _RETRYABLE_STATUS
+            except httpx.RequestError as e:
+                self._log.error(
+                    "Webhook delivery error",
+                    event_type=payload.event_type,
+                    event_id=payload.event_id,
+                    attempt=attempt + 1,
+                    error=str(e),
+                )
+                if isinstance(e, httpx.TransportError):
+                    continue
+                return False
+            finally:
+                self._record_outcome(receiver_ok)
 
             if response.status_code == 200:
-                logger.info(
+                self._log.debug(
                     "Webhook delivered successfully",
-                    event_type=payload.event_type.value,
+                    event_type=payload.event_type,
                     event_id=payload.event_id,
                     status_code=response.status_code,
                     is_duplicate=is_duplicate,
+                    attempt=attempt + 1,
                 )
                 return True
-            else:
-                logger.warning(
-                    "Webhook delivery failed",
-                    event_type=payload.event_type.value,
-                    event_id=payload.event_id,
-                    status_code=response.status_code,
-                    response_body=response.text[:200],
-                )
-                return False
 
-        except httpx.RequestError as e:
-            logger.error(
-                "Webhook delivery error",
-                event_type=payload.event_type.value,
+            self._log.warning(
+                "Webhook delivery failed",
+                event_type=payload.event_type,
                 event_id=payload.event_id,
-                error=str(e),
+                status_code=response.status_code,
+                response_body=response.text[:200],
+                attempt=attempt + 1,
             )
-            return False
+            if response.status_code not in _RETRYABLE_STATUS:
+                return False
+
+        return False
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Pick a full-jitter backoff delay before a retry.
+
+        Args:
+            attempt: Zero-based index of the attempt about to be made (>= 1).
+
+        Returns:
+            Delay in seconds, uniform in [0, min(max_delay, base * 2**(attempt-1))].
+        """
+        ceiling = min(
+            self._retry_max_delay, self._retry_base_delay * 2 ** (attempt - 1)
+        )
+        return random.uniform(0, ceiling)
+
+    async def _deliver_concurrently(
+        self,
+        deliveries: list[tuple[OutboundPayload, bytes, str]],
+        is_duplicate: bool = False,
+    ) -> None:
+        """Deliver several encoded webhooks at once.
+
+        A failing delivery is logged and does not cancel the others.
+
+        Args:
+            deliveries: (payload, payload_json, signature) tuples.
+            is_duplicate: Whether these are duplicate deliveries.
+        """
+        results = await asyncio.gather(
+            *[
+                self._deliver_webhook(payload, payload_json, signature, is_duplicate)
+                for payload, payload_json, signature in deliveries
+            ],
+            return_exceptions=True,
+        )
+        for (payload, _, _), result in zip(deliveries, results):
+            if isinstance(result, BaseException):
+                self._log.error(
+                    "Webhook delivery error",
+                    event_type=payload.event_type,
+                    event_id=payload.event_id,
+                    is_duplicate=is_duplicate,
+                    error=str(result),
+                )
 
     async def send_event(
         self,
         event_type: WebhookEventType,
         data: dict[str, Any],
         checkout_id: str | None = None,
+        timestamp: datetime | None = None,
     ) -> bool:
         """Send webhook event to CartPilot with potential chaos behaviors.
 
@@ -175,61 +478,121 @@ class WebhookSender:
             event_type: Type of event.
             data: Event-specific data.
             checkout_id: Related checkout ID for logging.
+            timestamp: Event time, when ``data`` already carries it; defaults
+                to now.
 
         Returns:
             True if primary delivery succeeded.
         """
-        payload = self._build_payload(event_type, data)
-
-        # Check for chaos scenarios
-        if self.chaos_controller:
-            # Out-of-order webhook chaos
-            if self.chaos_controller.should_trigger(ChaosScenario.OUT_OF_ORDER_WEBHOOK):
-                self._pending_webhooks.append(
-                    {
-                        "payload": payload,
-                        "checkout_id": checkout_id,
-                    }
+        payload = self._build_payload(event_type, data, timestamp=timestamp)
+
+        controller = self.chaos_controller
+        if controller is None or not controller.webhook_chaos_active:
+            payload_json, signature = await self._encode_payload(payload)
+            return await self._deliver_webhook(payload, payload_json, signature)
+
+        # Out-of-order webhook chaos
+        if controller.should_trigger(ChaosScenario.OUT_OF_ORDER_WEBHOOK):
+            if len(self._pending_webhooks) == self._pending_webhooks.maxlen:
+                dropped = self._pending_webhooks[0]["payload"]
+                self._log.warning(
+                    "Pending webhook dropped (queue full)",
+                    event_type=dropped.event_type,
+                    event_id=dropped.event_id,
                 )
-                self.chaos_controller.log_event(
-                    ChaosScenario.OUT_OF_ORDER_WEBHOOK,
-                    checkout_id,
-                    {
-                        "event_type": event_type.value,
-                        "event_id": payload.event_id,
-                        "action": "queued",
-                    },
-                )
-                logger.info(
-                    "Webhook queued for out-of-order delivery",
-                    event_type=event_type.value,
-                    event_id=payload.event_id,
-                )
-                # Don't send now, it will be sent later
-                return True
+            self._pending_webhooks.append(
+                {
+                    "payload": payload,
+                    "checkout_id": checkout_id,
+                }
+            )
+            controller.log_event(
+                ChaosScenario.OUT_OF_ORDER_WEBHOOK,
+                checkout_id,
+                {
+                    "event_type": payload.event_type,
+                    "event_id": payload.event_id,
+                    "action": "queued",
+                },
+            )
+            self._log.info(
+                "Webhook queued for out-of-order delivery",
+                event_type=payload.event_type,
+                event_id=payload.event_id,
+            )
+            # Don't send now, it will be sent later
+            return True
+
+        # Delayed webhook chaos
+        if controller.should_trigger(ChaosScenario.DELAYED_WEBHOOK):
+            delay = controller.config.webhook_delay_seconds
+            controller.log_event(
+                ChaosScenario.DELAYED_WEBHOOK,
+                checkout_id,
+                {
+                    "event_type": payload.event_type,
+                    "event_id": payload.event_id,
+                    "delay_seconds": delay,
+                },
+            )
+            self._log.info(
+                "Delaying webhook delivery",
+                event_type=payload.event_type,
+                event_id=payload.event_id,
+                delay=delay,
+            )
+            # Don't hold the caller for the delay; report it as accepted
+            # like a queued out-of-order webhook
+            self._spawn(self._deliver_later(payload, checkout_id, delay))
+            return True
 
-            # Delayed webhook chaos
-            if self.chaos_controller.should_trigger(ChaosScenario.DELAYED_WEBHOOK):
-                delay = self.chaos_controller.config.webhook_delay_seconds
-                self.chaos_controller.log_event(
-                    ChaosScenario.DELAYED_WEBHOOK,
-                    checkout_id,
-                    {
-                        "event_type": event_type.value,
-                        "event_id": payload.event_id,
-                        "delay_seconds": delay,
-                    },
-                )
-                logger.info(
-                    "Delaying webhook delivery",
-                    event_type=event_type.value,
-                    event_id=payload.event_id,
-                    delay=delay,
-                )
-                await asyncio.sleep(delay)
+        return await self._deliver_with_duplicates(payload, checkout_id)
+
+    def _spawn(self, coro: Coroutine[Any, Any, Any]) -> None:
+        """Run chaos follow-up work in a tracked background task.
+
+        Args:
+            coro: Coroutine to run.
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def wait_for_background_tasks(self) -> None:
+        """Wait for scheduled delayed and duplicate deliveries to finish."""
+        while self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+    async def _deliver_later(
+        self, payload: OutboundPayload, checkout_id: str | None, delay: float
+    ) -> None:
+        """Deliver a webhook after a chaos delay.
+
+        Args:
+            payload: Webhook payload.
+            checkout_id: Related checkout ID for logging.
+            delay: Seconds to wait before delivering.
+        """
+        await asyncio.sleep(delay)
+        await self._deliver_with_duplicates(payload, checkout_id)
+
+    async def _deliver_with_duplicates(
+        self, payload: OutboundPayload, checkout_id: str | None
+    ) -> bool:
+        """Deliver a webhook, then schedule any chaos duplicates of it.
+
+        Args:
+            payload: Webhook payload.
+            checkout_id: Related checkout ID for logging.
+
+        Returns:
+            True if the primary delivery succeeded.
+        """
+        # Duplicates share the body, so serialize and sign it only once
+        payload_json, signature = await self._encode_payload(payload)
 
         # Send primary webhook
-        success = await self._deliver_webhook(payload)
+        success = await self._deliver_webhook(payload, payload_json, signature)
 
         # Duplicate webhook chaos
         if self.chaos_controller and self.chaos_controller.should_trigger(
@@ -240,22 +603,29 @@ class WebhookSender:
                 ChaosScenario.DUPLICATE_WEBHOOK,
                 checkout_id,
                 {
-                    "event_type": event_type.value,
+                    "event_type": payload.event_type,
                     "event_id": payload.event_id,
                     "duplicate_count": duplicate_count,
                 },
             )
-            logger.info(
+            self._log.info(
                 "Sending duplicate webhooks",
-                event_type=event_type.value,
+                event_type=payload.event_type,
                 event_id=payload.event_id,
                 count=duplicate_count,
             )
 
-            # Send duplicates (with same event_id)
-            for i in range(duplicate_count - 1):  # -1 because we already sent one
-                await asyncio.sleep(0.1)  # Small delay between duplicates
-                await self._deliver_webhook(payload, is_duplicate=True)
+            # Send duplicates (with same event_id) concurrently in the
+            # background; -1 because we already sent one.
+            self._spawn(
+                self._deliver_concurrently(
+                    [
+                        (payload, payload_json, signature)
+                        for _ in range(duplicate_count - 1)
+                    ],
+                    is_duplicate=True,
+                )
+            )
 
         return success
 
@@ -271,36 +641,92 @@ class WebhookSender:
             return 0
 
         # Shuffle for random order
-        webhooks = self._pending_webhooks.copy()
-        random.shuffle(webhooks)
+        webhooks = list(self._pending_webhooks)
         self._pending_webhooks.clear()
+        random.shuffle(webhooks)
 
-        count = 0
         for webhook in webhooks:
             payload = webhook["payload"]
-            checkout_id = webhook["checkout_id"]
 
-            logger.info(
+            self._log.info(
                 "Flushing pending webhook (out-of-order)",
-                event_type=payload.event_type.value,
+                event_type=payload.event_type,
                 event_id=payload.event_id,
             )
 
             if self.chaos_controller:
                 self.chaos_controller.log_event(
                     ChaosScenario.OUT_OF_ORDER_WEBHOOK,
-                    checkout_id,
+                    webhook["checkout_id"],
                     {
-                        "event_type": payload.event_type.value,
+                        "event_type": payload.event_type,
                         "event_id": payload.event_id,
                         "action": "flushed",
                     },
                 )
 
-            await self._deliver_webhook(payload)
-            count += 1
+        payloads = [webhook["payload"] for webhook in webhooks]
+        if self.supports_batch and len(payloads) > 1:
+            if await self.send_batch(payloads):
+                return len(webhooks)
+            self._log.warning(
+                "Batch flush failed, delivering individually", count=len(payloads)
+            )
+
+        # Concurrent dispatch leaves arrival order to the network on top of
+        # the shuffle, which only strengthens the out-of-order chaos.
+        await self._deliver_concurrently(
+            [
+                (payload, *await self._encode_payload(payload))
+                for payload in payloads
+            ]
+        )
+        return len(webhooks)
+
+    async def send_batch(self, payloads: list[OutboundPayload]) -> bool:
+        """Deliver several webhooks in one request.
+
+        The body is ``{"events": [...]}`` in the given order, signed once
+        and POSTed to ``<webhook_url>/batch``. There is no retry; callers
+        fall back to per-event delivery on failure.
+
+        Args:
+            payloads: Webhook payloads to send together.
+
+        Returns:
+            True if the receiver accepted the batch.
+        """
+        body = b'{"events":' + _outbound_batch.dump_json(payloads) + b"}"
+        headers = {
+            **self._base_headers,
+            "X-Merchant-Signature": await self._sign_body(body),
+            "X-Webhook-Batch-Size": str(len(payloads)),
+        }
 
-        return count
+        if not self._breaker.allow_request():
+            return False
+        receiver_ok = False
+        try:
+            async with self._concurrency:
+                response = await self._client.post(
+                    f"{self.webhook_url}/batch", content=body, headers=headers
+                )
+            receiver_ok = response.status_code not in _RETRYABLE_STATUS
+        except httpx.RequestError as e:
+            self._log.error("Webhook batch delivery error", error=str(e))
+            return False
+        finally:
+            self._record_outcome(receiver_ok)
+
+        if response.status_code != 200:
+            self._log.warning(
+                "Webhook batch delivery failed",
+                status_code=response.status_code,
+                count=len(payloads),
+            )
+            return False
+        self._log.debug("Webhook batch delivered", count=len(payloads))
+        return True
 
     async def send_checkout_created(
         self, checkout_id: str, total: int, currency: str
@@ -372,6 +798,7 @@ class WebhookSender:
         Returns:
             True if delivery succeeded.
         """
+        now = datetime.now(timezone.utc)
         return await self.send_event(
             WebhookEventType.CHECKOUT_CONFIRMED,
             {
@@ -379,9 +806,10 @@ class WebhookSender:
                 "merchant_order_id": merchant_order_id,
                 "total": total,
                 "currency": currency,
-                "confirmed_at": datetime.now(timezone.utc).isoformat(),
+                "confirmed_at": now.isoformat(),
             },
             checkout_id=checkout_id,
+            timestamp=now,
         )
 
     async def send_checkout_failed(
@@ -427,6 +855,7 @@ class WebhookSender:
         Returns:
             True if delivery succeeded.
         """
+        now = datetime.now(timezone.utc)
         return await self.send_event(
             WebhookEventType.ORDER_CREATED,
             {
@@ -435,9 +864,10 @@ class WebhookSender:
                 "total": total,
                 "currency": currency,
                 "items": items,
-                "created_at": datetime.now(timezone.utc).isoformat(),
+                "created_at": now.isoformat(),
             },
             checkout_id=checkout_id,
+            timestamp=now,
         )
 
     async def send_order_shipped(
@@ -456,14 +886,16 @@ class WebhookSender:
         Returns:
             True if delivery succeeded.
         """
+        now = datetime.now(timezone.utc)
         return await self.send_event(
             WebhookEventType.ORDER_SHIPPED,
             {
                 "merchant_order_id": merchant_order_id,
                 "tracking_number": tracking_number,
                 "carrier": carrier,
-                "shipped_at": datetime.now(timezone.utc).isoformat(),
+                "shipped_at": now.isoformat(),
             },
+            timestamp=now,
         )
 
     async def send_order_delivered(self, merchant_order_id: str) -> bool:
@@ -475,12 +907,14 @@ class WebhookSender:
         Returns:
             True if delivery succeeded.
         """
+        now = datetime.now(timezone.utc)
         return await self.send_event(
             WebhookEventType.ORDER_DELIVERED,
             {
                 "merchant_order_id": merchant_order_id,
-                "delivered_at": datetime.now(timezone.utc).isoformat(),
+                "delivered_at": now.isoformat(),
             },
+            timestamp=now,
         )
 
     async def send_price_changed(
@@ -503,6 +937,7 @@ class WebhookSender:
         Returns:
             True if delivery succeeded.
         """
+        now = datetime.now(timezone.utc)
         return await self.send_event(
             WebhookEventType.PRICE_CHANGED,
             {
@@ -511,9 +946,10 @@ class WebhookSender:
                 "old_price": old_price,
                 "new_price": new_price,
                 "currency": currency,
-                "changed_at": datetime.now(timezone.utc).isoformat(),
+                "changed_at": now.isoformat(),
             },
             checkout_id=checkout_id,
+            timestamp=now,
         )
 
     async def send_stock_changed(
@@ -536,6 +972,7 @@ class WebhookSender:
         Returns:
             True if delivery succeeded.
         """
+        now = datetime.now(timezone.utc)
         return await self.send_event(
             WebhookEventType.STOCK_CHANGED,
             {
@@ -544,24 +981,30 @@ class WebhookSender:
                 "variant_id": variant_id,
                 "in_stock": in_stock,
                 "quantity": quantity,
-                "changed_at": datetime.now(timezone.utc).isoformat(),
+                "changed_at": now.isoformat(),
             },
             checkout_id=checkout_id,
+            timestamp=now,
         )
 
     async def close(self) -> None:
-        """Close HTTP client."""
+        """Finish background deliveries, then close HTTP client."""
+        await self.wait_for_background_tasks()
         await self._client.aclose()
 
 
 # Global webhook sender instance
 _webhook_sender: WebhookSender | None = None
+# Close tasks scheduled by reset_webhook_sender, held until they finish
+_closing_tasks: set["asyncio.Task[None]"] = set()
 
 
 def get_webhook_sender(
     webhook_url: str = "http://cartpilot-api:8000/webhooks/merchant",
     webhook_secret: str = "dev-webhook-secret-change-in-production",
     merchant_id: str = "merchant-b",
+    max_attempts: int = 3,
+    supports_batch: bool = False,
 ) -> WebhookSender:
     """Get or create webhook sender instance.
 
@@ -569,17 +1012,60 @@ def get_webhook_sender(
         webhook_url: Webhook URL.
         webhook_secret: Webhook secret.
         merchant_id: Merchant ID.
+        max_attempts: Delivery attempts per webhook, including the first.
+        supports_batch: Whether the receiver has a batch webhook endpoint.
 
     Returns:
         WebhookSender instance.
     """
     global _webhook_sender
     if _webhook_sender is None:
-        _webhook_sender = WebhookSender(webhook_url, webhook_secret, merchant_id)
+        _webhook_sender = WebhookSender(
+            webhook_url,
+            webhook_secret,
+            merchant_id,
+            max_attempts=max_attempts,
+            supports_batch=supports_batch,
+        )
     return _webhook_sender
 
 
-def reset_webhook_sender() -> None:
-    """Reset webhook sender instance (for testing)."""
+def _finish_close(task: "asyncio.Task[None]") -> None:
+    """Drop a finished close task and log any error it raised."""
+    _closing_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            "Failed to close discarded webhook sender", error=str(task.exception())
+        )
+
+
+def reset_webhook_sender() -> "asyncio.Task[None] | None":
+    """Reset webhook sender instance (for testing).
+
+    Closes the discarded sender's HTTP client unless the app lifespan already
+    did, so its pooled connections are not leaked. Without a running event
+    loop the client is closed before returning; inside one, closing is
+    scheduled on that loop.
+
+    Returns:
+        The task closing the client when called from a running event loop
+        (await it to wait for the close), otherwise None.
+    """
     global _webhook_sender
-    _webhook_sender = None
+    sender, _webhook_sender = _webhook_sender, None
+    if sender is None or sender._client.is_closed:
+        return None
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is None:
+        asyncio.run(sender.close())
+        return None
+
+    # Keep a reference until it finishes, or the task may be collected
+    task = loop.create_task(sender.close())
+    _closing_tasks.add(task)
+    task.add_done_callback(_finish_close)
+    return task
@@ -1,39 +1,71 @@
 """Pytest fixtures for Merchant B tests."""
 
+import os
+import random
+from collections.abc import Mapping
+from types import MappingProxyType
+
+# No webhook receiver runs under test; don't back off on every failed send
+os.environ.setdefault("WEBHOOK_MAX_ATTEMPTS", "1")
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
-from app.chaos import get_chaos_controller, reset_chaos_controller
-from app.checkout import get_checkout_store, reset_checkout_store
-from app.products import get_product_store, reset_product_store
-from app.webhooks import reset_webhook_sender
+from app.chaos import get_chaos_controller
+from app.checkout import get_checkout_store
+from app.products import get_product_store
+from app.webhooks import get_webhook_sender
 
 
 @pytest.fixture(autouse=True)
-def reset_stores():
-    """Reset all stores before each test."""
-    reset_product_store()
-    reset_checkout_store()
-    reset_chaos_controller()
-    reset_webhook_sender()
+def reset_stores(_session_client):
+    """Reset mutable state before each test.
+
+    The singletons are reset in place rather than replaced, so the app wired
+    up by the session-wide lifespan keeps seeing the same objects. The
+    product catalog only rolls back the products chaos touched. Depending on
+    the session client means the lifespan always creates the singletons from
+    ``settings`` first, whichever test happens to run first.
+    """
+    products = get_product_store()
+    products.reset_all_products()
+    products.set_price_change_percent(15)
+    get_checkout_store().reset_all()
+    chaos = get_chaos_controller()
+    chaos.reset()
+    chaos._rng = random.Random()  # tests stub _rng.random
+    get_webhook_sender().reset()
     yield
-    reset_product_store()
-    reset_checkout_store()
-    reset_chaos_controller()
-    reset_webhook_sender()
 
 
-@pytest.fixture
-def client():
-    """Create test client."""
+@pytest.fixture(scope="session")
+def _session_client():
+    """Test client whose app lifespan spans the whole session."""
     with TestClient(app) as client:
         yield client
 
 
+@pytest.fixture
+def client(_session_client):
+    """Get the shared test client.
+
+    Webhook work queued by the test is drained afterwards so it cannot leak
+    into the next one.
+    """
+    yield _session_client
+    _session_client.portal.call(app.state.webhook_queue.join)
+    _session_client.portal.call(get_webhook_sender().wait_for_background_tasks)
+
+
 @pytest.fixture
 def product_store():
-    """Get product store instance."""
+    """Get the session-wide product store.
+
+    It is seeded once, on first use, and shared with the app; reset_stores
+    rolls back the products a previous test changed.
+    """
     return get_product_store()
 
 
@@ -55,15 +87,57 @@ def sample_product_id(product_store):
     return product_store.get_random_product_id()
 
 
+@pytest.fixture(scope="session")
+def _sample_quote_payload() -> Mapping:
+    """Build the sample quote request once per session, read-only.
+
+    Product IDs are deterministic and stores are reset in place, so the
+    chosen product stays valid across tests.
+    """
+    item = MappingProxyType(
+        {"product_id": get_product_store().get_random_product_id(), "quantity": 1}
+    )
+    return MappingProxyType(
+        {"items": (item,), "customer_email": "test@example.com"}
+    )
+
+
 @pytest.fixture
-def sample_quote_request(sample_product_id):
-    """Create a sample quote request."""
+def sample_quote_request(_sample_quote_payload):
+    """Create a sample quote request (a fresh copy tests may modify)."""
     return {
-        "items": [
-            {
-                "product_id": sample_product_id,
-                "quantity": 1,
-            }
-        ],
-        "customer_email": "test@example.com",
+        **_sample_quote_payload,
+        "items": [dict(item) for item in _sample_quote_payload["items"]],
     }
+
+
+@pytest.fixture
+def fresh_quote(client, sample_quote_request) -> dict:
+    """Create a checkout quote for the sample request.
+
+    Returns:
+        The created checkout session as returned by the API.
+    """
+    response = client.post("/checkout/quote", json=sample_quote_request)
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+def webhook_requests() -> list[httpx.Request]:
+    """Requests received by ``mock_webhook_client``."""
+    return []
+
+
+@pytest.fixture
+def mock_webhook_client(webhook_requests) -> httpx.AsyncClient:
+    """In-memory HTTP client that records webhooks and answers 200.
+
+    ``MockTransport`` opens no sockets, so there is nothing to close.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        webhook_requests.append(request)
+        return httpx.Response(200)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
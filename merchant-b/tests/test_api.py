@@ -1,8 +1,16 @@
 """Tests for Merchant B API endpoints."""
 
+import logging
+import logging.handlers
+import re
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app.checkout import CheckoutItem
+from app.main import _app_logger
+
 
 class TestHealthEndpoints:
     """Tests for health endpoints."""
@@ -25,9 +33,9 @@ class TestHealthEndpoints:
         
         data = response.json()
         assert data["merchant_id"] == "merchant-b"
-        assert "product_count" in data
-        assert "checkout_count" in data
-        assert "chaos_event_count" in data
+        assert data["product_count"] > 0
+        assert data["checkout_count"] == 0
+        assert data["chaos_event_count"] == 0
 
 
 class TestProductEndpoints:
@@ -53,6 +61,68 @@ class TestProductEndpoints:
         assert data["page"] == 1
         assert data["page_size"] == 5
 
+    def test_list_products_with_cursor(self, client: TestClient):
+        """Test that following next_cursor visits every product once in order."""
+        params = {"page_size": 7, "sort_by": "price", "sort_order": "desc"}
+        expected = client.get(
+            "/products", params={**params, "page_size": 100}
+        ).json()["items"]
+
+        seen = []
+        response = client.get("/products", params=params).json()
+        while True:
+            seen.extend(response["items"])
+            if not response["has_more"]:
+                break
+            response = client.get(
+                "/products", params={**params, "cursor": response["next_cursor"]}
+            ).json()
+
+        assert [p["id"] for p in seen] == [p["id"] for p in expected]
+        assert response["next_cursor"] is None
+
+    def test_list_products_without_total(self, client: TestClient):
+        """Test that with_total=false skips counting but still pages."""
+        response = client.get("/products", params={"page_size": 5, "with_total": False})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total"] is None
+        assert len(data["items"]) == 5
+        assert data["has_more"] is True
+
+    def test_list_products_page_cache(
+        self, client: TestClient, product_store, sample_product_id, monkeypatch
+    ):
+        """Test that identical queries reuse a page until the store changes."""
+        calls = []
+        list_products = product_store.list_products
+
+        def counting_list_products(*args, **kwargs):
+            calls.append(kwargs)
+            return list_products(*args, **kwargs)
+
+        monkeypatch.setattr(product_store, "list_products", counting_list_products)
+        product_store.page_cache.clear()
+
+        client.get("/products?brand=Acme&page_size=5")
+        client.get("/products?page_size=5&brand=Acme")
+        assert len(calls) == 1
+
+        params = {"in_stock": True, "page_size": 100}
+        client.get("/products", params=params)
+        product_store.trigger_out_of_stock(sample_product_id)
+        response = client.get("/products", params=params)
+        ids = [p["id"] for p in response.json()["items"]]
+        assert sample_product_id not in ids
+        assert len(calls) == 3
+
+    def test_list_products_invalid_cursor(self, client: TestClient):
+        """Test that a malformed cursor is rejected."""
+        response = client.get("/products", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+        assert response.json()["error_code"] == "INVALID_CURSOR"
+
     def test_list_products_with_filters(self, client: TestClient):
         """Test product filtering."""
         response = client.get("/products", params={"in_stock": True})
@@ -70,6 +140,51 @@ class TestProductEndpoints:
         data = response.json()
         assert data["id"] == sample_product_id
 
+    def test_get_product_not_modified(
+        self, client: TestClient, product_store, sample_product_id: str
+    ):
+        """Test that a matching If-None-Match returns 304 until the product changes."""
+        etag = client.get(f"/products/{sample_product_id}").headers["etag"]
+
+        response = client.get(
+            f"/products/{sample_product_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+
+        _, new_price = product_store.trigger_price_change(sample_product_id)
+        response = client.get(
+            f"/products/{sample_product_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["price"]["amount"] == new_price
+
+    def test_get_unknown_product_ignores_if_none_match(self, client: TestClient):
+        """Test an unknown product is a 404 even with a matching-looking tag."""
+        response = client.get(
+            "/products/missing", headers={"If-None-Match": 'W/"missing-0"'}
+        )
+        assert response.status_code == 404
+        assert response.json()["error_code"] == "PRODUCT_NOT_FOUND"
+
+    def test_list_products_etag_ignores_param_order(
+        self, client: TestClient, product_store, sample_product_id: str
+    ):
+        """Test that list ETags normalize query order and follow store changes."""
+        etag = client.get("/products?brand=Acme&page_size=5").headers["etag"]
+
+        response = client.get(
+            "/products?page_size=5&brand=Acme", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        product_store.trigger_out_of_stock(sample_product_id)
+        response = client.get(
+            "/products?page_size=5&brand=Acme", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
     def test_get_product_not_found(self, client: TestClient):
         """Test getting non-existent product."""
         response = client.get("/products/nonexistent")
@@ -142,7 +257,7 @@ class TestCheckoutEndpoints:
         
         data = response.json()
         assert data["status"] == "confirmed"
-        assert "merchant_order_id" in data
+        assert re.fullmatch(r"ORD-\d{14}-[0-9A-F]{8}", data["merchant_order_id"])
 
     def test_confirm_checkout_not_found(self, client: TestClient):
         """Test confirming non-existent checkout."""
@@ -151,3 +266,46 @@ class TestCheckoutEndpoints:
             json={"payment_method": "test_card"},
         )
         assert response.status_code == 404
+
+    def test_get_checkout_expired(
+        self, client: TestClient, checkout_store, sample_quote_request: dict
+    ):
+        """Test that a checkout past its expiration is reported as expired."""
+        response = client.post("/checkout/quote", json=sample_quote_request)
+        checkout_id = response.json()["id"]
+
+        session = checkout_store._sessions[checkout_id]
+        session.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+        response = client.get(f"/checkout/{checkout_id}")
+        assert response.status_code == 200
+        assert response.json()["status"] == "expired"
+
+
+class TestCheckoutItem:
+    """Tests for the internal checkout item."""
+
+    def test_line_total_derived(self):
+        """Test line_total is computed from unit price and quantity."""
+        item = CheckoutItem(
+            product_id="p1",
+            variant_id=None,
+            sku="SKU-1",
+            title="Widget",
+            unit_price=1250,
+            quantity=3,
+        )
+        assert item.line_total == 3750
+
+
+class TestLogging:
+    """Tests for the app's logging setup."""
+
+    def test_app_logs_do_not_touch_root_logger(self):
+        """Test JSON logs use a dedicated logger and library logs stay out."""
+        root = logging.getLogger()
+        assert not any(
+            isinstance(h, logging.handlers.QueueHandler) for h in root.handlers
+        )
+        assert _app_logger.propagate is False
+        assert not logging.getLogger("httpx").isEnabledFor(logging.INFO)
@@ -1,12 +1,27 @@
 """Tests for Merchant B chaos mode functionality."""
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
-from app.chaos import ChaosController
+from app.chaos import ChaosController, NullChaosController
 from app.checkout import CheckoutStore
 from app.products import ProductStore
-from app.schemas import ChaosScenario
+from app.schemas import (
+    ChaosConfigRequest,
+    ChaosScenario,
+    CheckoutItemRequest,
+    CheckoutStatus,
+)
+
+# Static request bodies, pre-encoded once so tests post bytes directly.
+JSON_HEADERS = {"content-type": "application/json"}
+CONFIRM_PAYLOAD = b'{"payment_method":"test_card"}'
+CONFIGURE_PAYLOAD = (
+    b'{"scenarios":{"price_change":true,"out_of_stock":false},'
+    b'"price_change_percent":20}'
+)
 
 
 class TestChaosConfiguration:
@@ -26,13 +41,8 @@ class TestChaosConfiguration:
         """Test configuring chaos mode."""
         response = client.post(
             "/chaos/configure",
-            json={
-                "scenarios": {
-                    "price_change": True,
-                    "out_of_stock": False,
-                },
-                "price_change_percent": 20,
-            },
+            content=CONFIGURE_PAYLOAD,
+            headers=JSON_HEADERS,
         )
         assert response.status_code == 200
         
@@ -52,10 +62,12 @@ class TestChaosConfiguration:
         for scenario_enabled in data["scenarios"].values():
             assert scenario_enabled is True
 
-    def test_disable_all_chaos(self, client: TestClient):
+    def test_disable_all_chaos(
+        self, client: TestClient, chaos_controller: ChaosController
+    ):
         """Test disabling all chaos scenarios."""
-        # First enable
-        client.post("/chaos/enable")
+        # First enable (directly; only the endpoint under test goes over HTTP)
+        chaos_controller.enable_all()
         
         # Then disable
         response = client.post("/chaos/disable")
@@ -66,31 +78,47 @@ class TestChaosConfiguration:
         for scenario_enabled in data["scenarios"].values():
             assert scenario_enabled is False
 
-    def test_enable_single_scenario(self, client: TestClient):
+    @pytest.mark.parametrize("scenario", list(ChaosScenario))
+    def test_enable_single_scenario(
+        self, client: TestClient, scenario: ChaosScenario
+    ):
         """Test enabling a single chaos scenario."""
-        response = client.post("/chaos/scenarios/price_change/enable")
+        response = client.post(f"/chaos/scenarios/{scenario.value}/enable")
         assert response.status_code == 200
         
         data = response.json()
         assert data["enabled"] is True
-        assert data["scenarios"]["price_change"] is True
-
-    def test_disable_single_scenario(self, client: TestClient):
+        assert data["scenarios"][scenario.value] is True
+        assert sum(data["scenarios"].values()) == 1
+
+    @pytest.mark.parametrize("scenario", list(ChaosScenario))
+    def test_disable_single_scenario(
+        self,
+        client: TestClient,
+        chaos_controller: ChaosController,
+        scenario: ChaosScenario,
+    ):
         """Test disabling a single chaos scenario."""
         # First enable
-        client.post("/chaos/scenarios/price_change/enable")
+        chaos_controller.enable_scenario(scenario)
         
         # Then disable
-        response = client.post("/chaos/scenarios/price_change/disable")
+        response = client.post(f"/chaos/scenarios/{scenario.value}/disable")
         assert response.status_code == 200
         
         data = response.json()
-        assert data["scenarios"]["price_change"] is False
+        assert data["scenarios"][scenario.value] is False
+
+    def test_unknown_scenario_rejected(self, client: TestClient):
+        """Test that an unknown scenario name is rejected."""
+        response = client.post("/chaos/scenarios/meteor_strike/enable")
+        assert response.status_code == 422
+        assert response.json()["error_code"] == "INVALID_SCENARIO"
 
-    def test_chaos_reset(self, client: TestClient):
+    def test_chaos_reset(self, client: TestClient, chaos_controller: ChaosController):
         """Test resetting chaos controller."""
         # Configure some chaos
-        client.post("/chaos/enable")
+        chaos_controller.enable_all()
         
         # Reset
         response = client.post("/chaos/reset")
@@ -124,11 +152,12 @@ class TestChaosEvents:
 class TestPriceChangeChaos:
     """Tests for price change chaos scenario."""
 
-    def test_manual_price_change(self, client: TestClient, sample_product_id: str):
+    def test_manual_price_change(
+        self, client: TestClient, product_store: ProductStore, sample_product_id: str
+    ):
         """Test manually triggering a price change."""
         # Get original price
-        response = client.get(f"/products/{sample_product_id}")
-        original_price = response.json()["price"]["amount"]
+        original_price = product_store.get_effective_price(sample_product_id)
         
         # Trigger price change (increase)
         response = client.post(
@@ -142,16 +171,13 @@ class TestPriceChangeChaos:
         assert data["new_price"] > original_price
 
     def test_price_change_causes_checkout_failure(
-        self, client: TestClient, sample_quote_request: dict
+        self, client: TestClient, sample_quote_request: dict, fresh_quote: dict
     ):
         """Test that price change causes checkout confirmation to fail."""
         # Disable chaos (we'll manually trigger price change)
         client.post("/chaos/disable")
         
-        # Create quote
-        response = client.post("/checkout/quote", json=sample_quote_request)
-        assert response.status_code == 201
-        checkout_id = response.json()["id"]
+        checkout_id = fresh_quote["id"]
         product_id = sample_quote_request["items"][0]["product_id"]
         
         # Manually trigger price change
@@ -160,7 +186,8 @@ class TestPriceChangeChaos:
         # Try to confirm - should fail
         response = client.post(
             f"/checkout/{checkout_id}/confirm",
-            json={"payment_method": "test_card"},
+            content=CONFIRM_PAYLOAD,
+            headers=JSON_HEADERS,
         )
         assert response.status_code == 409
         
@@ -168,51 +195,74 @@ class TestPriceChangeChaos:
         assert data["error_code"] == "PRICE_CHANGED"
 
     def test_price_change_chaos_triggers(
-        self, client: TestClient, sample_quote_request: dict
+        self,
+        client: TestClient,
+        chaos_controller: ChaosController,
+        sample_quote_request: dict,
     ):
-        """Test that price change chaos can trigger during confirmation."""
-        # Enable only price change chaos
+        """Test that price change chaos triggers during confirmation."""
+        # Enable only price change chaos, and force it to fire
         client.post("/chaos/disable")
         client.post("/chaos/scenarios/price_change/enable")
-        
-        # Create quote
+        chaos_controller._rng.random = lambda: 0.0
+
         response = client.post("/checkout/quote", json=sample_quote_request)
         assert response.status_code == 201
         checkout_id = response.json()["id"]
-        
-        # Try to confirm multiple times - chaos should eventually trigger
-        # (probabilistic, so we try multiple times)
-        price_changed = False
-        for _ in range(10):
-            # Reset product first
-            product_id = sample_quote_request["items"][0]["product_id"]
-            client.post(f"/admin/reset-product/{product_id}")
-            
-            # Create new quote
-            response = client.post("/checkout/quote", json=sample_quote_request)
-            checkout_id = response.json()["id"]
-            
-            # Try to confirm
-            response = client.post(
-                f"/checkout/{checkout_id}/confirm",
-                json={"payment_method": "test_card"},
-            )
-            
-            if response.status_code == 409:
-                data = response.json()
-                if data["error_code"] == "PRICE_CHANGED":
-                    price_changed = True
-                    break
-        
-        # Due to probability, this might not trigger every time
-        # Just verify the mechanism works
-        assert price_changed or response.status_code == 200
+
+        response = client.post(
+            f"/checkout/{checkout_id}/confirm",
+            content=CONFIRM_PAYLOAD,
+            headers=JSON_HEADERS,
+        )
+
+        assert response.status_code == 409
+        assert response.json()["error_code"] == "PRICE_CHANGED"
+
+    def test_price_change_chaos_fails_confirm(
+        self,
+        chaos_controller: ChaosController,
+        checkout_store: CheckoutStore,
+        sample_product_id: str,
+    ):
+        """Test a forced price-change roll fails confirmation in the store."""
+        chaos_controller.enable_scenario(ChaosScenario.PRICE_CHANGE)
+        session = checkout_store.create_quote(
+            [CheckoutItemRequest(product_id=sample_product_id, quantity=1)]
+        )
+        chaos_controller._rng.random = lambda: 0.0
+
+        with pytest.raises(ValueError, match="Price changed"):
+            checkout_store.confirm_checkout(session.id)
+        assert session.status == CheckoutStatus.FAILED
+        assert session.failure_reason == "PRICE_CHANGED"
+
+    def test_disabled_scenarios_do_not_draw_randomness(
+        self,
+        client: TestClient,
+        chaos_controller: ChaosController,
+        checkout_store: CheckoutStore,
+        sample_quote_request: dict,
+    ):
+        """Test that confirm skips the RNG when price/stock chaos is off."""
+        client.post("/chaos/disable")
+        client.post("/chaos/scenarios/duplicate_webhook/enable")
+
+        def fail():
+            raise AssertionError("RNG should not be consulted")
+
+        response = client.post("/checkout/quote", json=sample_quote_request)
+        chaos_controller._rng.random = fail
+        session = checkout_store.confirm_checkout(response.json()["id"])
+        assert session.status == CheckoutStatus.CONFIRMED
 
 
 class TestOutOfStockChaos:
     """Tests for out of stock chaos scenario."""
 
-    def test_manual_out_of_stock(self, client: TestClient, sample_product_id: str):
+    def test_manual_out_of_stock(
+        self, client: TestClient, product_store: ProductStore, sample_product_id: str
+    ):
         """Test manually triggering out of stock."""
         response = client.post(f"/admin/trigger-out-of-stock/{sample_product_id}")
         assert response.status_code == 200
@@ -220,21 +270,18 @@ class TestOutOfStockChaos:
         data = response.json()
         assert data["in_stock"] is False
         
-        # Verify product is now out of stock
-        response = client.get(f"/products/{sample_product_id}")
-        assert response.json()["in_stock"] is False
+        # Verify the body the products endpoint serves is now out of stock
+        product = json.loads(product_store.get_product_json(sample_product_id))
+        assert product["in_stock"] is False
 
     def test_out_of_stock_causes_checkout_failure(
-        self, client: TestClient, sample_quote_request: dict
+        self, client: TestClient, sample_quote_request: dict, fresh_quote: dict
     ):
         """Test that out of stock causes checkout confirmation to fail."""
         # Disable chaos
         client.post("/chaos/disable")
         
-        # Create quote
-        response = client.post("/checkout/quote", json=sample_quote_request)
-        assert response.status_code == 201
-        checkout_id = response.json()["id"]
+        checkout_id = fresh_quote["id"]
         product_id = sample_quote_request["items"][0]["product_id"]
         
         # Manually trigger out of stock
@@ -243,14 +290,17 @@ class TestOutOfStockChaos:
         # Try to confirm - should fail
         response = client.post(
             f"/checkout/{checkout_id}/confirm",
-            json={"payment_method": "test_card"},
+            content=CONFIRM_PAYLOAD,
+            headers=JSON_HEADERS,
         )
         assert response.status_code == 409
         
         data = response.json()
         assert data["error_code"] == "OUT_OF_STOCK"
 
-    def test_reset_product(self, client: TestClient, sample_product_id: str):
+    def test_reset_product(
+        self, client: TestClient, product_store: ProductStore, sample_product_id: str
+    ):
         """Test resetting a product after chaos."""
         # Trigger out of stock
         client.post(f"/admin/trigger-out-of-stock/{sample_product_id}")
@@ -259,9 +309,9 @@ class TestOutOfStockChaos:
         response = client.post(f"/admin/reset-product/{sample_product_id}")
         assert response.status_code == 200
         
-        # Verify product is back in stock
-        response = client.get(f"/products/{sample_product_id}")
-        assert response.json()["in_stock"] is True
+        # Verify the body the products endpoint serves is back in stock
+        product = json.loads(product_store.get_product_json(sample_product_id))
+        assert product["in_stock"] is True
 
 
 class TestChaosController:
@@ -274,18 +324,94 @@ class TestChaosController:
         for _ in range(100):
             assert chaos_controller.should_trigger(ChaosScenario.PRICE_CHANGE) is False
 
-    def test_should_trigger_enabled(self, chaos_controller: ChaosController):
-        """Test that enabled scenarios can trigger."""
+    @pytest.mark.parametrize("roll, expected", [(0.0, True), (0.49, True), (0.5, False)])
+    def test_should_trigger_enabled(
+        self, chaos_controller: ChaosController, roll: float, expected: bool
+    ):
+        """Test that enabled scenarios trigger below their 50% threshold."""
         chaos_controller.enable_scenario(ChaosScenario.PRICE_CHANGE)
-        
-        # With 50% probability, should trigger at least once in 100 tries
-        triggered = False
-        for _ in range(100):
-            if chaos_controller.should_trigger(ChaosScenario.PRICE_CHANGE):
-                triggered = True
-                break
-        
-        assert triggered is True
+        chaos_controller._rng.random = lambda: roll
+
+        assert chaos_controller.should_trigger(ChaosScenario.PRICE_CHANGE) is expected
+
+    def test_webhook_chaos_active_follows_config(
+        self, chaos_controller: ChaosController
+    ):
+        """Test the webhook fast-path flag tracks webhook scenarios only."""
+        assert chaos_controller.webhook_chaos_active is False
+
+        chaos_controller.enable_scenario(ChaosScenario.PRICE_CHANGE)
+        assert chaos_controller.webhook_chaos_active is False
+
+        chaos_controller.enable_scenario(ChaosScenario.DELAYED_WEBHOOK)
+        assert chaos_controller.webhook_chaos_active is True
+
+        chaos_controller.disable_all()
+        assert chaos_controller.webhook_chaos_active is False
+
+    def test_should_trigger_uses_configured_out_of_stock_probability(
+        self, chaos_controller: ChaosController
+    ):
+        """Test that configure updates the out-of-stock trigger threshold."""
+        chaos_controller._rng.random = lambda: 0.5
+        chaos_controller.configure(
+            ChaosConfigRequest(
+                scenarios={ChaosScenario.OUT_OF_STOCK: True},
+                out_of_stock_probability=0.6,
+            )
+        )
+        assert chaos_controller.should_trigger(ChaosScenario.OUT_OF_STOCK) is True
+
+        chaos_controller.configure(
+            ChaosConfigRequest(
+                scenarios={ChaosScenario.OUT_OF_STOCK: True},
+                out_of_stock_probability=0.4,
+            )
+        )
+        assert chaos_controller.should_trigger(ChaosScenario.OUT_OF_STOCK) is False
+
+    def test_should_trigger_certain_probability_skips_rng(
+        self, chaos_controller: ChaosController
+    ):
+        """Test that a probability of 1.0 triggers without drawing."""
+        chaos_controller.configure(
+            ChaosConfigRequest(
+                scenarios={ChaosScenario.OUT_OF_STOCK: True},
+                out_of_stock_probability=1.0,
+            )
+        )
+
+        def fail():
+            raise AssertionError("RNG should not be consulted")
+
+        chaos_controller._rng.random = fail
+        assert chaos_controller.should_trigger(ChaosScenario.OUT_OF_STOCK) is True
+
+    def test_checkout_store_defaults_to_null_controller(
+        self, product_store: ProductStore, sample_product_id: str
+    ):
+        """Test that a store without a controller confirms without chaos."""
+        store = CheckoutStore(product_store=product_store)
+        assert isinstance(store.chaos_controller, NullChaosController)
+
+        product_store.reset_product(sample_product_id)
+        session = store.create_quote(
+            [CheckoutItemRequest(product_id=sample_product_id, quantity=1)]
+        )
+        session = store.confirm_checkout(session.id)
+        assert session.status == CheckoutStatus.CONFIRMED
+
+    def test_get_config_cached_until_changed(
+        self, chaos_controller: ChaosController
+    ):
+        """Test that get_config is reused until the config changes."""
+        first = chaos_controller.get_config()
+        assert chaos_controller.get_config() is first
+
+        updated = chaos_controller.enable_scenario(ChaosScenario.PRICE_CHANGE)
+        assert updated is not first
+        assert updated.scenarios[ChaosScenario.PRICE_CHANGE] is True
+        assert chaos_controller.get_config() is updated
 
     def test_log_event(self, chaos_controller: ChaosController):
         """Test logging chaos events."""
@@ -299,6 +425,14 @@ class TestChaosController:
         assert event.checkout_id == "test-checkout-id"
         assert event.details["old_price"] == 1000
 
+    def test_event_log_is_bounded(self, chaos_controller: ChaosController):
+        """Test that the event log keeps only the most recent events."""
+        for i in range(ChaosController.MAX_EVENT_LOG_SIZE + 5):
+            chaos_controller.log_event(ChaosScenario.PRICE_CHANGE, f"checkout-{i}", {})
+
+        assert len(chaos_controller._event_log) == ChaosController.MAX_EVENT_LOG_SIZE
+        assert chaos_controller._event_log[0].checkout_id == "checkout-5"
+
     def test_get_events_filtered(self, chaos_controller: ChaosController):
         """Test getting filtered chaos events."""
         # Log some events
@@ -318,6 +452,47 @@ class TestChaosController:
         assert len(response.events) == 1
         assert response.events[0].scenario == ChaosScenario.PRICE_CHANGE
 
+    def test_get_events_by_checkout_most_recent_first(
+        self, chaos_controller: ChaosController
+    ):
+        """Test filtering by checkout returns newest events first."""
+        chaos_controller.log_event(ChaosScenario.PRICE_CHANGE, "checkout-1", {"n": 1})
+        chaos_controller.log_event(ChaosScenario.OUT_OF_STOCK, "checkout-2", {})
+        chaos_controller.log_event(ChaosScenario.OUT_OF_STOCK, "checkout-1", {"n": 2})
+
+        response = chaos_controller.get_events(checkout_id="checkout-1")
+        assert [e.details["n"] for e in response.events] == [2, 1]
+
+        response = chaos_controller.get_events(
+            checkout_id="checkout-1", scenario=ChaosScenario.OUT_OF_STOCK
+        )
+        assert [e.details["n"] for e in response.events] == [2]
+
+    def test_get_events_empty_checkout_filter_ignored(
+        self, chaos_controller: ChaosController
+    ):
+        """Test an empty checkout_id filter returns the unfiltered log."""
+        chaos_controller.log_event(ChaosScenario.PRICE_CHANGE, "checkout-1", {"n": 1})
+        chaos_controller.log_event(ChaosScenario.OUT_OF_STOCK, "checkout-2", {"n": 2})
+
+        response = chaos_controller.get_events(checkout_id="")
+        assert [e.details["n"] for e in response.events] == [2, 1]
+
+        response = chaos_controller.get_events(
+            checkout_id="", scenario=ChaosScenario.PRICE_CHANGE
+        )
+        assert [e.details["n"] for e in response.events] == [1]
+
+    def test_get_events_skips_evicted_events(self, chaos_controller: ChaosController):
+        """Test that filtered queries only see events still in the log."""
+        chaos_controller.log_event(ChaosScenario.OUT_OF_STOCK, "evicted", {})
+        for _ in range(ChaosController.MAX_EVENT_LOG_SIZE):
+            chaos_controller.log_event(ChaosScenario.PRICE_CHANGE, "checkout-1", {})
+
+        assert chaos_controller.get_events(checkout_id="evicted").events == []
+        response = chaos_controller.get_events(scenario=ChaosScenario.OUT_OF_STOCK)
+        assert response.events == []
+
 
 class TestAdminEndpoints:
     """Tests for admin endpoints."""
@@ -1,8 +1,12 @@
 """Tests for Product Store with chaos support."""
 
+from concurrent.futures import ThreadPoolExecutor
+from itertools import pairwise
+
 import pytest
 
-from app.products import ProductStore, get_product_store
+import app.products as products_module
+from app.products import CATEGORIES, ProductStore, get_product_store
 
 
 class TestProductStore:
@@ -13,15 +17,38 @@ class TestProductStore:
         store = ProductStore(seed=100)
         assert len(store._products) > 0
 
-    def test_product_store_deterministic(self):
-        """Test product store is deterministic with same seed."""
-        store1 = ProductStore(seed=100)
-        store2 = ProductStore(seed=100)
+    @pytest.mark.parametrize("seed", [2**70, -(2**70)])
+    def test_product_store_accepts_large_seed(self, seed):
+        """Test seeds beyond 64 bits still build a store."""
+        store = ProductStore(seed=seed, products_per_category=1)
+        assert len(store._products) > 0
 
-        products1 = list(store1._products.keys())
-        products2 = list(store2._products.keys())
+    def test_get_product_store_concurrent_first_calls(self, monkeypatch):
+        """Test concurrent first calls share a single store."""
+        # Start from no store; the shared one is restored afterwards
+        monkeypatch.setattr(products_module, "_product_store", None)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            stores = list(pool.map(lambda _: get_product_store(), range(8)))
+        assert all(store is stores[0] for store in stores)
+
+    def test_generated_prices_end_in_99_within_range(self, product_store):
+        """Test generated prices are whole dollars plus .99 within the range."""
+        ranges = {c["id"]: c["price_range"] for c in CATEGORIES}
+        for product in product_store._products.values():
+            low, high = ranges[product.category_id]
+            assert product.original_price % 100 == 99
+            assert low <= product.original_price <= high
 
-        assert products1 == products2
+    def test_product_store_deterministic(self, product_store):
+        """Test product store is deterministic with same seed."""
+        # Compare one fresh store against the shared one rather than building two
+        store = ProductStore(
+            merchant_id=product_store.merchant_id,
+            seed=product_store.seed,
+            products_per_category=product_store.products_per_category,
+        )
+
+        assert list(store._products) == list(product_store._products)
 
     def test_get_product(self, product_store, sample_product_id):
         """Test getting product by ID."""
@@ -46,6 +73,90 @@ class TestProductStore:
         for item in items:
             assert item.category_id == 100
 
+    def test_list_products_filter_brand_and_category(self, product_store):
+        """Test combined brand/category filters match a full scan."""
+        product = next(iter(product_store._products.values()))
+        items, total = product_store.list_products(
+            category_id=product.category_id,
+            brand=product.brand.upper(),
+            page_size=100,
+        )
+        expected = [
+            p.id
+            for p in product_store._products.values()
+            if p.category_id == product.category_id and p.brand == product.brand
+        ]
+        assert [item.id for item in items] == expected
+        assert total == len(expected)
+
+    def test_list_products_total_capped(self, product_store):
+        """Test that max_total caps the reported total."""
+        _, total = product_store.list_products(max_total=3)
+        assert total == 3
+
+        _, total = product_store.list_products(with_total=False)
+        assert total is None
+
+    def test_list_products_search(self, product_store):
+        """Test search matches substrings of title or description."""
+        items, _ = product_store.list_products(search="COLLECTION", page_size=100)
+        assert len(items) == len(product_store._products)
+
+    @pytest.mark.parametrize(
+        "search", ["lap", "laptop 15", "top 15\"", "pro\nhigh", " ", "zzz"]
+    )
+    def test_list_products_search_matches_substring_scan(
+        self, product_store, search
+    ):
+        """Test the word index never changes plain substring search results."""
+        expected = [
+            p.id
+            for p in product_store._products.values()
+            if search.lower() in p.title.lower()
+            or search.lower() in p.description.lower()
+        ]
+        items, total = product_store.list_products(search=search, page_size=100)
+        assert [item.id for item in items] == expected
+        assert total == len(expected)
+
+    def test_list_products_search_does_not_span_fields(
+        self, product_store, sample_product_id
+    ):
+        """Test a query cannot match across the title/description boundary."""
+        product = product_store._products[sample_product_id]
+        search = f"{product.title[-3:]}\n{product.description[:3]}"
+
+        items, total = product_store.list_products(search=search, page_size=100)
+        assert items == []
+        assert total == 0
+
+    def test_list_products_combined_filters_follow_stock_changes(
+        self, product_store, sample_product_id
+    ):
+        """Test intersected filters match a plain scan as stock changes."""
+        product = product_store._products[sample_product_id]
+        filters = {"category_id": product.category_id, "brand": product.brand}
+
+        def expected(in_stock: bool) -> list[str]:
+            return [
+                p.id
+                for p in product_store._products.values()
+                if p.category_id == product.category_id
+                and p.brand == product.brand
+                and p.in_stock == in_stock
+            ]
+
+        product_store.reset_product(sample_product_id)
+        items, _ = product_store.list_products(in_stock=True, **filters)
+        assert sample_product_id in [item.id for item in items]
+
+        product_store.trigger_out_of_stock(sample_product_id)
+        for in_stock in (True, False):
+            items, total = product_store.list_products(in_stock=in_stock, **filters)
+            assert [item.id for item in items] == expected(in_stock)
+            assert total == len(expected(in_stock))
+        assert sample_product_id in expected(False)
+
     def test_list_products_filter_in_stock(self, product_store):
         """Test filtering products by stock status."""
         items, _ = product_store.list_products(in_stock=True)
@@ -56,7 +167,60 @@ class TestProductStore:
         """Test sorting products by price."""
         items, _ = product_store.list_products(sort_by="price", sort_order="asc")
         prices = [item.price.amount for item in items]
-        assert prices == sorted(prices)
+        assert all(a <= b for a, b in pairwise(prices))
+
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    def test_list_products_price_range_sorted_by_price(
+        self, product_store, sort_order
+    ):
+        """Test a price range on a price-sorted list includes both bounds."""
+        prices = sorted(p.current_price for p in product_store._products.values())
+        low, high = prices[3], prices[-4]
+
+        items, total = product_store.list_products(
+            min_price=low,
+            max_price=high,
+            sort_by="price",
+            sort_order=sort_order,
+            page_size=100,
+        )
+
+        in_range = [
+            p
+            for p in product_store._products.values()
+            if low <= p.current_price <= high
+        ]
+        expected = sorted(
+            in_range, key=lambda p: product_store._sort_key(p, "price", sort_order)
+        )
+        assert [item.id for item in items] == [p.id for p in expected]
+        assert total == len(expected)
+
+    def test_list_products_sort_reflects_price_change(
+        self, product_store, sample_product_id
+    ):
+        """Test that cached price ordering is refreshed after chaos."""
+        product_store.list_products(sort_by="price", sort_order="desc")
+        top_price = max(p.current_price for p in product_store._products.values())
+        while product_store.get_effective_price(sample_product_id) <= top_price:
+            product_store.trigger_price_change(sample_product_id, increase=True)
+
+        items, _ = product_store.list_products(sort_by="price", sort_order="desc")
+        assert items[0].id == sample_product_id
+
+    def test_price_orders_stay_sorted_through_chaos(self, product_store):
+        """Test incremental price reordering matches a full re-sort."""
+        product_ids = list(product_store._products)
+        for i, product_id in enumerate(product_ids[::3]):
+            product_store.trigger_price_change(product_id, increase=i % 2 == 0)
+        product_store.reset_product(product_ids[0])
+
+        for sort_order in ("asc", "desc"):
+            expected = sorted(
+                product_store._products.values(),
+                key=lambda p: product_store._sort_key(p, "price", sort_order),
+            )
+            assert product_store._sorted[("price", sort_order)] == expected
 
     def test_get_effective_price(self, product_store, sample_product_id):
         """Test getting effective price."""
@@ -76,6 +240,24 @@ class TestProductStore:
         result = product_store.check_stock(sample_product_id, None, 10000)
         assert result is False
 
+    def test_get_product_bundle_matches_individual_lookups(
+        self, product_store, sample_product_id
+    ):
+        """Test bundle lookup agrees with the individual accessors."""
+        product = product_store._products[sample_product_id]
+        for variant_id in [None, *(v["id"] for v in product.variants)]:
+            bundle = product_store.get_product_bundle(sample_product_id, variant_id, 1)
+            assert bundle is not None
+            found, variant, price, stock_ok = bundle
+            assert found is product
+            assert variant == (product_store.get_variant(variant_id) if variant_id else None)
+            assert price == product_store.get_effective_price(sample_product_id, variant_id)
+            assert stock_ok == product_store.check_stock(sample_product_id, variant_id, 1)
+
+    def test_get_product_bundle_not_found(self, product_store):
+        """Test bundle lookup for non-existent product."""
+        assert product_store.get_product_bundle("non-existent", None, 1) is None
+
 
 class TestProductStoreChaos:
     """Test product store chaos mode functionality."""
@@ -90,6 +272,22 @@ class TestProductStoreChaos:
         assert old_price == original_price
         assert new_price > old_price
 
+    def test_cached_schema_refreshed_after_chaos(
+        self, product_store, sample_product_id
+    ):
+        """Test product schemas are reused until chaos changes the product."""
+        schema = product_store.get_product(sample_product_id)
+        assert product_store.get_product(sample_product_id) is schema
+
+        _, new_price = product_store.trigger_price_change(sample_product_id)
+        product_store.trigger_out_of_stock(sample_product_id)
+
+        refreshed = product_store.get_product(sample_product_id)
+        assert refreshed.price.amount == new_price
+        assert refreshed.in_stock is False
+        items, _ = product_store.list_products(page_size=100)
+        assert refreshed in items
+
     def test_trigger_price_change_decrease(self, product_store, sample_product_id):
         """Test triggering price decrease."""
         original_price = product_store.get_effective_price(sample_product_id)
@@ -113,6 +311,21 @@ class TestProductStoreChaos:
         assert product.in_stock is False
         assert product.stock_quantity == 0
 
+    def test_trigger_variant_out_of_stock(self, product_store):
+        """Test a variant stock change shows in the product and variant views."""
+        product = next(p for p in product_store._products.values() if p.variants)
+        variant_id = product.variants[0]["id"]
+
+        assert product_store.trigger_out_of_stock(product.id, variant_id) is True
+        assert product_store.get_variant(variant_id)["in_stock"] is False
+        schema = product_store.get_product(product.id)
+        assert schema.variants[0].in_stock is False
+        assert schema.variants[0].stock_quantity == 0
+
+        product_store.reset_product(product.id)
+        assert product_store.get_variant(variant_id)["in_stock"] is True
+        assert product_store.get_product(product.id).variants[0].in_stock is True
+
     def test_trigger_out_of_stock_not_found(self, product_store):
         """Test triggering out-of-stock for non-existent product."""
         success = product_store.trigger_out_of_stock("non-existent")
@@ -144,6 +357,22 @@ class TestProductStoreChaos:
         product = product_store._products[sample_product_id]
         assert product.in_stock is True
 
+    def test_reset_all_products_visits_only_changed(
+        self, product_store, sample_product_id
+    ):
+        """Test repeated resets only revisit products chaos has changed."""
+        product_store.reset_all_products()
+        assert not product_store._dirty
+        version = product_store.version
+
+        product_store.trigger_price_change(sample_product_id)
+        product_store.reset_all_products()
+
+        product = product_store._products[sample_product_id]
+        assert product.current_price == product.original_price
+        assert product_store.version == version + 2
+        assert not product_store._dirty
+
     def test_get_random_product_id(self, product_store):
         """Test getting random product ID."""
         product_id = product_store.get_random_product_id()
@@ -167,21 +396,17 @@ class TestLowInventory:
 
     def test_some_products_have_low_stock(self, product_store):
         """Test that some products have low stock quantities."""
-        low_stock_count = 0
-        for product in product_store._products.values():
-            if product.stock_quantity <= 15:
-                low_stock_count += 1
-
         # All products should have low stock (1-15)
-        assert low_stock_count == len(product_store._products)
+        assert all(
+            p.stock_quantity <= 15 for p in product_store._products.values()
+        )
 
     def test_some_variants_out_of_stock(self, product_store):
-        """Test that some variants may be out of stock."""
-        out_of_stock_count = 0
-        for variant_data in product_store._variants.values():
-            if not variant_data.get("in_stock", True):
-                out_of_stock_count += 1
-
-        # Some variants may be out of stock (stock_quantity was randint(0, 8))
-        # This is not guaranteed but likely
-        pass  # Just verify the mechanism exists
+        """Test that variant availability follows variant stock."""
+        # Generation leaves some variants at zero stock, but reset_product
+        # restocks them, so after the shared store's first reset "any out of
+        # stock" no longer holds; check the flag tracks the quantity instead
+        assert all(
+            v["in_stock"] == (v["stock_quantity"] > 0)
+            for v in product_store._variants.values()
+        )
@@ -1,23 +1,90 @@
 """Tests for Merchant B webhook chaos functionality."""
 
+import asyncio
+import dataclasses
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+
+import httpx
 import pytest
 from unittest.mock import AsyncMock, patch
 
+import app.webhooks as webhooks_module
 from app.chaos import ChaosController
-from app.schemas import ChaosScenario, WebhookEventType
-from app.webhooks import WebhookSender
+from app.schemas import ChaosScenario, WebhookEventType, WebhookPayloadSchema
+from app.webhooks import (
+    CircuitBreaker,
+    CircuitState,
+    WebhookSender,
+    get_webhook_sender,
+    reset_webhook_sender,
+)
+
+
+def _recording_deliver() -> tuple[list[tuple], Callable[..., Awaitable[bool]]]:
+    """Build a succeeding ``_deliver_webhook`` stand-in and its call log.
+
+    Returns:
+        The list each call's positional arguments are appended to, and the
+        coroutine function to patch in place of ``_deliver_webhook``.
+    """
+    calls: list[tuple] = []
+
+    async def deliver(*args, **kwargs) -> bool:
+        calls.append(args)
+        return True
+
+    return calls, deliver
+
+
+@contextmanager
+def _swap_deliver(
+    sender: WebhookSender, deliver: Callable[..., Awaitable[bool]]
+) -> Iterator[None]:
+    """Shadow ``sender._deliver_webhook`` for the duration of the block.
+
+    A plain instance-attribute swap: the stub is called without ``self``, and
+    deleting it on exit exposes the class method again.
+    """
+    sender._deliver_webhook = deliver
+    try:
+        yield
+    finally:
+        del sender._deliver_webhook
+
+
+@pytest.fixture(scope="module")
+def signing_sender() -> WebhookSender:
+    """Create one sender shared by the signing cases.
+
+    Signing only copies the keyed HMAC template, so nothing leaks between
+    cases; tests that deliver or touch chaos state use ``webhook_sender``.
+    """
+    return WebhookSender(
+        webhook_url="http://localhost:8000/webhooks/merchant",
+        webhook_secret="test-secret",
+        client=httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200))
+        ),
+    )
 
 
 class TestWebhookSender:
     """Tests for WebhookSender with chaos mode."""
 
     @pytest.fixture
-    def webhook_sender(self):
-        """Create a webhook sender for testing."""
+    def webhook_sender(self, mock_webhook_client):
+        """Create a webhook sender delivering to an in-memory transport."""
         return WebhookSender(
             webhook_url="http://localhost:8000/webhooks/merchant",
             webhook_secret="test-secret",
             merchant_id="merchant-b",
+            client=mock_webhook_client,
         )
 
     @pytest.fixture
@@ -36,28 +103,203 @@ class TestWebhookSender:
         assert payload.merchant_id == "merchant-b"
         assert payload.data["checkout_id"] == "test-123"
 
-    def test_sign_payload(self, webhook_sender: WebhookSender):
-        """Test payload signing."""
-        signature = webhook_sender._sign_payload('{"test": "data"}')
-        
-        assert signature.startswith("sha256=")
-        assert len(signature) > 10
+    def test_event_ids_unique_hex(self, webhook_sender: WebhookSender):
+        """Test generated event IDs are unique 32-char hex UUIDs."""
+        ids = {webhook_sender._generate_event_id() for _ in range(100)}
+
+        assert len(ids) == 100
+        for event_id in ids:
+            assert uuid.UUID(hex=event_id).version == 4
+            assert event_id == event_id.lower() and len(event_id) == 32
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_encode_payload_matches_validated_schema(
+        self, webhook_sender: WebhookSender
+    ):
+        """Test the outbound payload serializes like the webhook schema."""
+        payload = webhook_sender._build_payload(
+            WebhookEventType.ORDER_CREATED,
+            {"checkout_id": "test-123", "items": [{"quantity": 2}]},
+        )
+        payload_json, _ = await webhook_sender._encode_payload(payload)
+
+        validated = WebhookPayloadSchema.model_validate(dataclasses.asdict(payload))
+        assert payload_json == validated.model_dump_json().encode()
+        assert b'"ucp_version":"1.0.0"' in payload_json
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_large_payload_signed_off_loop(self, webhook_sender: WebhookSender):
+        """Test large bodies are signed in a worker thread with the same result."""
+        payload = webhook_sender._build_payload(
+            WebhookEventType.ORDER_CREATED,
+            {"items": [{"sku": f"SKU-{i:04d}", "quantity": 1} for i in range(200)]},
+        )
+
+        with patch(
+            "app.webhooks.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as to_thread:
+            payload_json, signature = await webhook_sender._encode_payload(payload)
+
+        to_thread.assert_called_once()
+        assert signature == webhook_sender._sign_payload(payload_json)
+
+    @pytest.mark.parametrize(
+        "body", [b'{"test": "data"}', b'{"a": 1}', b'{"b": 2}', b""]
+    )
+    def test_sign_payload(self, signing_sender: WebhookSender, body: bytes):
+        """Test the cached HMAC template signs like a freshly keyed HMAC."""
+        expected = hmac.new(b"test-secret", body, hashlib.sha256).hexdigest()
+
+        assert signing_sender._sign_payload(body) == f"sha256={expected}"
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_deliver_webhook_headers(
+        self, webhook_sender: WebhookSender, webhook_requests
+    ):
+        """Test primary and duplicate deliveries carry the expected headers."""
+        payload = webhook_sender._build_payload(
+            WebhookEventType.CHECKOUT_QUOTED, {"checkout_id": "test-123"}
+        )
+        payload_json, signature = await webhook_sender._encode_payload(payload)
+
+        assert await webhook_sender._deliver_webhook(payload, payload_json, signature)
+        assert await webhook_sender._deliver_webhook(
+            payload, payload_json, signature, is_duplicate=True
+        )
+
+        expected = {
+            "content-type": "application/json",
+            "x-merchant-id": "merchant-b",
+            "x-merchant-signature": signature,
+            "x-event-id": payload.event_id,
+            "idempotency-key": payload.event_id,
+            "x-webhook-attempt": "1",
+        }
+        primary, duplicate = webhook_requests
+        for request, is_retry in ((primary, None), (duplicate, "true")):
+            assert request.content == payload_json
+            assert {k: request.headers.get(k) for k in expected} == expected
+            assert request.headers.get("x-is-retry") == is_retry
+        assert "X-Is-Retry" not in webhook_sender._base_headers
+
+    @pytest.mark.asyncio(loop_scope="module")
+    @pytest.mark.parametrize(
+        "outcomes, expected, attempts",
+        [
+            ([503, 200], True, 2),
+            ([httpx.ConnectError("refused"), 429, 200], True, 3),
+            ([401], False, 1),
+            ([502, 502, 502], False, 3),
+        ],
+    )
+    async def test_deliver_webhook_retries(
+        self, outcomes, expected: bool, attempts: int
+    ):
+        """Test only transport errors and retryable statuses are retried."""
+        sender = WebhookSender(
+            webhook_url="http://localhost:8000/webhooks/merchant",
+            webhook_secret="test-secret",
+            retry_base_delay=0.0,
+        )
+        payload = sender._build_payload(
+            WebhookEventType.CHECKOUT_QUOTED, {"checkout_id": "test-123"}
+        )
+        responses = [
+            o if isinstance(o, Exception) else httpx.Response(o) for o in outcomes
+        ]
+
+        with patch.object(
+            sender._client, "post", new_callable=AsyncMock, side_effect=responses
+        ) as mock_post:
+            result = await sender._deliver_webhook(
+                payload, *await sender._encode_payload(payload)
+            )
+
+        assert result is expected
+        assert mock_post.await_count == attempts
+        retried = [
+            c.kwargs["headers"].get("X-Is-Retry") for c in mock_post.await_args_list
+        ]
+        assert retried == [None] + ["true"] * (attempts - 1)
+        numbered = [
+            c.kwargs["headers"]["X-Webhook-Attempt"] for c in mock_post.await_args_list
+        ]
+        assert numbered == [str(n) for n in range(1, attempts + 1)]
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_deliveries_bounded_by_max_concurrent(self):
+        """Test concurrent deliveries never exceed max_concurrent in flight."""
+        sender = WebhookSender(
+            webhook_url="http://localhost:8000/webhooks/merchant",
+            webhook_secret="test-secret",
+            max_concurrent=2,
+        )
+        payload = sender._build_payload(
+            WebhookEventType.CHECKOUT_QUOTED, {"checkout_id": "test-123"}
+        )
+        encoded = await sender._encode_payload(payload)
+        in_flight = peak = 0
+
+        async def post(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        with patch.object(sender._client, "post", side_effect=post):
+            await sender._deliver_concurrently([(payload, *encoded)] * 6)
+
+        assert peak == 2
 
-    @pytest.mark.asyncio
+    def test_retry_delay_full_jitter(self, webhook_sender: WebhookSender):
+        """Test retry delays stay within the doubling, capped ceiling."""
+        for attempt, ceiling in ((1, 0.5), (2, 1.0), (3, 2.0), (10, 30.0)):
+            for _ in range(20):
+                assert 0 <= webhook_sender._retry_delay(attempt) <= ceiling
+
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_send_event_without_chaos(self, webhook_sender: WebhookSender):
         """Test sending event without chaos enabled."""
-        with patch.object(webhook_sender, "_deliver_webhook", new_callable=AsyncMock) as mock_deliver:
-            mock_deliver.return_value = True
-            
+        calls, deliver = _recording_deliver()
+        with _swap_deliver(webhook_sender, deliver):
             result = await webhook_sender.send_event(
                 WebhookEventType.CHECKOUT_QUOTED,
                 {"checkout_id": "test-123"},
             )
             
             assert result is True
-            mock_deliver.assert_called_once()
+            assert len(calls) == 1
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_event_time_matches_envelope(self, webhook_sender: WebhookSender):
+        """Test data timestamps and the envelope timestamp share one instant."""
+        calls, deliver = _recording_deliver()
+        with _swap_deliver(webhook_sender, deliver):
+            await webhook_sender.send_order_delivered("order-123")
+
+        payload = calls[0][0]
+        assert payload.data["delivered_at"] == payload.timestamp.isoformat()
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_send_event_skips_chaos_checks_when_inactive(
+        self, webhook_sender: WebhookSender, chaos_controller: ChaosController
+    ):
+        """Test no scenario is rolled while no webhook chaos is enabled."""
+        webhook_sender.set_chaos_controller(chaos_controller)
+        chaos_controller.enable_scenario(ChaosScenario.PRICE_CHANGE)
+
+        with patch.object(
+            chaos_controller, "should_trigger", wraps=chaos_controller.should_trigger
+        ) as should_trigger:
+            assert await webhook_sender.send_event(
+                WebhookEventType.CHECKOUT_QUOTED, {"checkout_id": "test-123"}
+            )
 
-    @pytest.mark.asyncio
+        should_trigger.assert_not_called()
+
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_duplicate_webhook_chaos(
         self, webhook_sender: WebhookSender, chaos_controller: ChaosController
     ):
@@ -66,14 +308,8 @@ class TestWebhookSender:
         chaos_controller.enable_scenario(ChaosScenario.DUPLICATE_WEBHOOK)
         chaos_controller.config.duplicate_webhook_count = 3
         
-        delivery_count = 0
-        
-        async def count_deliveries(*args, **kwargs):
-            nonlocal delivery_count
-            delivery_count += 1
-            return True
-        
-        with patch.object(webhook_sender, "_deliver_webhook", side_effect=count_deliveries):
+        calls, deliver = _recording_deliver()
+        with _swap_deliver(webhook_sender, deliver):
             # Force the scenario to trigger
             chaos_controller._rng.random = lambda: 0.5  # 50% < 70%, will trigger
             
@@ -81,11 +317,68 @@ class TestWebhookSender:
                 WebhookEventType.CHECKOUT_QUOTED,
                 {"checkout_id": "test-123"},
             )
+            # Duplicates go out in the background
+            await webhook_sender.wait_for_background_tasks()
             
             # Should have sent 3 webhooks (1 original + 2 duplicates)
-            assert delivery_count == 3
+            assert len(calls) == 3
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_duplicate_webhooks_signed_once(
+        self, webhook_sender: WebhookSender, chaos_controller: ChaosController
+    ):
+        """Test duplicates reuse one signed body and survive a failing send."""
+        webhook_sender.set_chaos_controller(chaos_controller)
+        chaos_controller.enable_scenario(ChaosScenario.DUPLICATE_WEBHOOK)
+        chaos_controller.config.duplicate_webhook_count = 4
+        chaos_controller._rng.random = lambda: 0.5
+
+        bodies = []
+
+        async def deliver(payload, payload_json, signature, is_duplicate=False):
+            bodies.append((payload_json, signature))
+            if is_duplicate and len(bodies) == 2:
+                raise RuntimeError("boom")
+            return True
+
+        with patch.object(
+            webhook_sender, "_sign_payload", wraps=webhook_sender._sign_payload
+        ) as sign, _swap_deliver(webhook_sender, deliver):
+            result = await webhook_sender.send_event(
+                WebhookEventType.CHECKOUT_QUOTED,
+                {"checkout_id": "test-123"},
+            )
+            await webhook_sender.wait_for_background_tasks()
+
+        assert result is True
+        assert len(bodies) == 4
+        assert len(set(bodies)) == 1
+        sign.assert_called_once()
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_delayed_webhook_does_not_block_caller(
+        self, webhook_sender: WebhookSender, chaos_controller: ChaosController
+    ):
+        """Test delayed chaos returns at once and delivers in the background."""
+        webhook_sender.set_chaos_controller(chaos_controller)
+        chaos_controller.enable_scenario(ChaosScenario.DELAYED_WEBHOOK)
+        chaos_controller.config.webhook_delay_seconds = 0.05
+        chaos_controller._rng.random = lambda: 0.1
+
+        calls, deliver = _recording_deliver()
+        with _swap_deliver(webhook_sender, deliver):
+            result = await webhook_sender.send_event(
+                WebhookEventType.CHECKOUT_QUOTED,
+                {"checkout_id": "test-123"},
+            )
+
+            assert result is True
+            assert calls == []
+
+            await webhook_sender.wait_for_background_tasks()
+            assert len(calls) == 1
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_out_of_order_webhook_chaos(
         self, webhook_sender: WebhookSender, chaos_controller: ChaosController
     ):
@@ -96,9 +389,8 @@ class TestWebhookSender:
         # Force trigger
         chaos_controller._rng.random = lambda: 0.3  # 30% < 40%, will trigger
         
-        with patch.object(webhook_sender, "_deliver_webhook", new_callable=AsyncMock) as mock_deliver:
-            mock_deliver.return_value = True
-            
+        calls, deliver = _recording_deliver()
+        with _swap_deliver(webhook_sender, deliver):
             # Send event - should be queued
             await webhook_sender.send_event(
                 WebhookEventType.CHECKOUT_QUOTED,
@@ -107,22 +399,248 @@ class TestWebhookSender:
             
             # Should not have delivered yet (queued)
             assert len(webhook_sender._pending_webhooks) == 1
-            mock_deliver.assert_not_called()
+            assert calls == []
             
             # Flush pending webhooks
             count = await webhook_sender.flush_pending_webhooks()
             
             assert count == 1
-            mock_deliver.assert_called_once()
+            assert len(calls) == 1
             assert len(webhook_sender._pending_webhooks) == 0
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_flush_survives_failed_delivery(
+        self, webhook_sender: WebhookSender, chaos_controller: ChaosController
+    ):
+        """Test a failing flushed webhook does not stop the others."""
+        webhook_sender.set_chaos_controller(chaos_controller)
+        chaos_controller.enable_scenario(ChaosScenario.OUT_OF_ORDER_WEBHOOK)
+        chaos_controller._rng.random = lambda: 0.3
+
+        for i in range(3):
+            await webhook_sender.send_event(
+                WebhookEventType.CHECKOUT_QUOTED, {"checkout_id": f"test-{i}"}
+            )
+
+        delivered = []
+
+        async def deliver(payload, payload_json, signature, is_duplicate=False):
+            if payload.data["checkout_id"] == "test-1":
+                raise RuntimeError("boom")
+            delivered.append(payload.data["checkout_id"])
+            return True
+
+        with _swap_deliver(webhook_sender, deliver):
+            count = await webhook_sender.flush_pending_webhooks()
+
+        assert count == 3
+        assert sorted(delivered) == ["test-0", "test-2"]
+
+    @pytest.mark.asyncio(loop_scope="module")
+    @pytest.mark.parametrize("batch_status", [200, 404])
+    async def test_flush_as_batch(
+        self, chaos_controller: ChaosController, batch_status: int
+    ):
+        """Test batch flushing posts once, falling back to per-event on failure."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.url.path.endswith("/batch"):
+                return httpx.Response(batch_status)
+            return httpx.Response(200)
+
+        sender = WebhookSender(
+            webhook_url="http://localhost:8000/webhooks/merchant",
+            webhook_secret="test-secret",
+            chaos_controller=chaos_controller,
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            supports_batch=True,
+        )
+        chaos_controller.enable_scenario(ChaosScenario.OUT_OF_ORDER_WEBHOOK)
+        chaos_controller._rng.random = lambda: 0.3
+        for i in range(3):
+            await sender.send_event(
+                WebhookEventType.CHECKOUT_QUOTED, {"checkout_id": f"test-{i}"}
+            )
+
+        assert await sender.flush_pending_webhooks() == 3
+
+        batch = requests[0]
+        assert batch.url.path == "/webhooks/merchant/batch"
+        assert batch.headers["x-merchant-signature"] == sender._sign_payload(
+            batch.content
+        )
+        events = json.loads(batch.content)["events"]
+        assert sorted(e["data"]["checkout_id"] for e in events) == [
+            "test-0",
+            "test-1",
+            "test-2",
+        ]
+        assert len(requests) == (1 if batch_status == 200 else 4)
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_pending_webhooks_bounded(self, chaos_controller: ChaosController):
+        """Test the out-of-order queue drops its oldest entry when full."""
+        sender = WebhookSender(
+            webhook_url="http://localhost:8000/webhooks/merchant",
+            webhook_secret="test-secret",
+            chaos_controller=chaos_controller,
+            max_pending_webhooks=2,
+        )
+        chaos_controller.enable_scenario(ChaosScenario.OUT_OF_ORDER_WEBHOOK)
+        chaos_controller._rng.random = lambda: 0.3
+
+        for i in range(3):
+            await sender.send_event(
+                WebhookEventType.CHECKOUT_QUOTED, {"checkout_id": f"test-{i}"}
+            )
+
+        queued = [w["payload"].data["checkout_id"] for w in sender._pending_webhooks]
+        assert queued == ["test-1", "test-2"]
+
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_flush_pending_webhooks_empty(self, webhook_sender: WebhookSender):
         """Test flushing when no pending webhooks."""
         count = await webhook_sender.flush_pending_webhooks()
         assert count == 0
 
 
+class TestWebhookSenderSingleton:
+    """Tests for the module-level webhook sender."""
+
+    def test_shared_sender_uses_settings(self):
+        """Test the shared sender is configured from settings, not defaults."""
+        from app.main import settings
+
+        sender = get_webhook_sender()
+        assert sender._max_attempts == settings.webhook_max_attempts
+        assert sender.supports_batch is settings.webhook_supports_batch
+
+    def test_reset_closes_client(self, monkeypatch):
+        """Test resetting the sender closes its HTTP client."""
+        # Work on a fresh sender; the shared one is restored afterwards
+        monkeypatch.setattr(webhooks_module, "_webhook_sender", None)
+        client = get_webhook_sender()._client
+
+        reset_webhook_sender()
+
+        assert client.is_closed
+        assert get_webhook_sender()._client is not client
+        reset_webhook_sender()
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_reset_inside_running_loop_returns_close_task(self, monkeypatch):
+        """Test resetting inside a loop schedules a close that can be awaited."""
+        monkeypatch.setattr(webhooks_module, "_webhook_sender", None)
+        client = get_webhook_sender()._client
+
+        task = reset_webhook_sender()
+
+        assert task in webhooks_module._closing_tasks
+        await task
+        assert client.is_closed
+        assert task not in webhooks_module._closing_tasks
+
+
+class TestCircuitBreaker:
+    """Tests for the webhook circuit breaker."""
+
+    def test_opens_after_threshold_and_probes(self, monkeypatch):
+        """Test the breaker opens, waits out the window, then probes once."""
+        now = [100.0]
+        monkeypatch.setattr("app.webhooks.time.monotonic", lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=2, recovery_window=30.0)
+
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.allow_request()
+
+        now[0] += 30.0
+        assert breaker.allow_request()
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        now[0] += 30.0
+        assert breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.allow_request()
+
+    def test_unreported_probe_expires(self, monkeypatch):
+        """Test a half-open probe that never reports back frees its slot."""
+        now = [100.0]
+        monkeypatch.setattr("app.webhooks.time.monotonic", lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=1, recovery_window=30.0)
+        breaker.record_failure()
+
+        now[0] += 30.0
+        assert breaker.allow_request()
+        now[0] += 29.0
+        assert not breaker.allow_request()
+        now[0] += 1.0
+        assert breaker.allow_request()
+        assert breaker.state is CircuitState.HALF_OPEN
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_cancelled_probe_reopens_circuit(
+        self, mock_webhook_client, monkeypatch
+    ):
+        """Test a probe cancelled mid-request is recorded as a failure."""
+        now = [100.0]
+        monkeypatch.setattr("app.webhooks.time.monotonic", lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=1, recovery_window=30.0)
+        breaker.record_failure()
+        now[0] += 30.0
+        sender = WebhookSender(
+            webhook_url="http://localhost:8000/webhooks/merchant",
+            webhook_secret="test-secret",
+            max_attempts=1,
+            circuit_breaker=breaker,
+            client=mock_webhook_client,
+        )
+        payload = sender._build_payload(
+            WebhookEventType.CHECKOUT_QUOTED, {"checkout_id": "test-123"}
+        )
+        encoded = await sender._encode_payload(payload)
+
+        async def cancelled(*args, **kwargs):
+            raise asyncio.CancelledError
+
+        with patch.object(sender._client, "post", cancelled):
+            with pytest.raises(asyncio.CancelledError):
+                await sender._deliver_webhook(payload, *encoded)
+
+        assert breaker.state is CircuitState.OPEN
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_open_circuit_skips_network(self):
+        """Test deliveries fail fast without posting while the circuit is open."""
+        sender = WebhookSender(
+            webhook_url="http://localhost:8000/webhooks/merchant",
+            webhook_secret="test-secret",
+            max_attempts=1,
+            circuit_breaker=CircuitBreaker(failure_threshold=2),
+        )
+        payload = sender._build_payload(
+            WebhookEventType.CHECKOUT_QUOTED, {"checkout_id": "test-123"}
+        )
+        encoded = await sender._encode_payload(payload)
+
+        with patch.object(
+            sender._client, "post", new_callable=AsyncMock
+        ) as mock_post:
+            mock_post.return_value = httpx.Response(503)
+            for _ in range(4):
+                assert await sender._deliver_webhook(payload, *encoded) is False
+
+        assert mock_post.await_count == 2
+
+
 class TestWebhookChaosIntegration:
     """Integration tests for webhook chaos via API."""
 
@@ -134,22 +652,18 @@ class TestWebhookChaosIntegration:
         data = response.json()
         assert "flushed" in data
 
+    def test_quote_webhook_delivered_by_worker(self, client, sample_quote_request):
+        """Test that quote webhooks are delivered by the worker pool."""
+        sender = get_webhook_sender()
+        calls, deliver = _recording_deliver()
+        with _swap_deliver(sender, deliver):
+            response = client.post("/checkout/quote", json=sample_quote_request)
+            assert response.status_code == 201
+
+            deadline = time.monotonic() + 2.0
+            while not calls and time.monotonic() < deadline:
+                time.sleep(0.01)
 
-# Import client fixture from conftest
-@pytest.fixture
-def client():
-    """Create test client."""
-    from fastapi.testclient import TestClient
-    from app.main import app
-    from app.chaos import reset_chaos_controller
-    from app.checkout import reset_checkout_store
-    from app.products import reset_product_store
-    from app.webhooks import reset_webhook_sender
-    
-    reset_product_store()
-    reset_checkout_store()
-    reset_chaos_controller()
-    reset_webhook_sender()
-    
-    with TestClient(app) as client:
-        yield client
+            assert len(calls) == 1
+            payload = calls[0][0]
+            assert payload.event_type == WebhookEventType.CHECKOUT_QUOTED